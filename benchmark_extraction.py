@@ -0,0 +1,275 @@
+"""
+Banc d'essai hors ligne de l'extraction : rejoue des pages de matchs (sauvegardées ou synthétiques)
+dans la validation de date et l'extraction des lignes, sans se connecter à Spordle
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, date, timedelta
+from html import escape
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlparse, parse_qs
+
+from selenium.common.exceptions import NoSuchElementException
+
+os.environ.setdefault('SPORDLE_PASS', 'benchmark')
+
+from models import SpordleConfig
+from schedule_parser import parse_schedule_html
+from spordle_facebook import PageReadiness, SpordleScheduleExtractor
+
+BASELINE_FILE = Path(__file__).with_name('benchmark_extraction_baseline.json')
+
+# Date fixe des pages synthétiques : les résultats ne dépendent pas du jour de l'exécution
+SYNTHETIC_START = date(2025, 7, 5)
+
+HOME_TEAMS = ["TITANS 2 - 9U - A - Mixte - QUÉBEC", "TITANS - 11U - B - Masculin - QUÉBEC", "TITANS 3 - 13U - A - Féminin - QUÉBEC"]
+AWAY_TEAMS = ["TOROS 3 - 9U - B - Masculin - LOTBINIÈRE", "ROYAUX 1 - 11U - A - Mixte - CHARLESBOURG", "DIABLOS - 13U - B - Masculin - LÉVIS"]
+VENUES = ["Parc Ferland - Baseball 1", "Parc Chauveau - Baseball 2", "Terrain Duberger - Baseball"]
+
+class ReplayElement:
+    """Élément retourné par find_element : seule sa présence compte pour les attentes"""
+
+class ReplayDriver:
+    """Remplace le WebDriver : sert les pages sauvegardées selon le paramètre page= et compte les appels"""
+
+    def __init__(self, pages: List[str]):
+        self.pages = pages
+        self.calls = Counter()
+        self.html = ""
+        self.url = "about:blank"
+
+    def set_page_load_timeout(self, seconds: float):
+        self.calls['set_page_load_timeout'] += 1
+
+    def get(self, url: str):
+        self.calls['get'] += 1
+        self.url = url
+        page = int(parse_qs(urlparse(url).query).get('page', ['1'])[0])
+        self.html = self.pages[page - 1] if page <= len(self.pages) else "<html><body></body></html>"
+
+    @property
+    def current_url(self) -> str:
+        self.calls['current_url'] += 1
+        return self.url
+
+    @property
+    def page_source(self) -> str:
+        self.calls['page_source'] += 1
+        return self.html
+
+    def _matches(self, value: str) -> bool:
+        return any(selector.split('.', 1)[-1] in self.html for selector in value.split(','))
+
+    def find_element(self, by, value):
+        self.calls['find_element'] += 1
+        if not self._matches(value):
+            raise NoSuchElementException(value)
+        return ReplayElement()
+
+    def find_elements(self, by, value):
+        self.calls['find_elements'] += 1
+        return [ReplayElement()] if self._matches(value) else []
+
+    def execute_script(self, script: str, *args):
+        self.calls['execute_script'] += 1
+        return ['complete', 0]
+
+    def get_log(self, log_type: str):
+        self.calls['get_log'] += 1
+        return []
+
+    def quit(self):
+        pass
+
+@dataclass
+class Scenario:
+    """Pages rejouées et date recherchée"""
+    name: str
+    pages: List[str]
+    target: date
+    per_page: int = 100
+
+@dataclass
+class ScenarioResult:
+    name: str
+    pages: int
+    page_kb: float
+    rows: int
+    matches: int
+    parse_ms: float
+    extract_ms: float
+    driver_calls: int
+    peak_kb: float
+    failures: List[str] = field(default_factory=list)
+
+def _game_row(index: int) -> str:
+    hour = 8 + index % 12
+    return (
+        '<tr class="MuiTableRow-root">'
+        f'<td class="MuiTableCell-root column-number"><span class="MuiTypography-root">#{1000 + index}</span></td>'
+        f'<td class="MuiTableCell-root column-time"><span class="MuiTypography-root MuiTypography-body2 MuiTypography-noWrap">{hour:02d}:{(index * 15) % 60:02d}</span></td>'
+        '<td class="MuiTableCell-root column-homeTeamId">'
+        f'<p class="MuiTypography-root MuiTypography-body2 MuiTypography-displayInline">{escape(HOME_TEAMS[index % len(HOME_TEAMS)])}</p>'
+        f'<p class="MuiTypography-root MuiTypography-body2 MuiTypography-displayInline">{escape(AWAY_TEAMS[index % len(AWAY_TEAMS)])}</p>'
+        '</td>'
+        f'<td class="MuiTableCell-root column-arenaId"><p class="MuiTypography-root MuiTypography-displayInline">{escape(VENUES[index % len(VENUES)])}</p></td>'
+        '</tr>'
+    )
+
+def synthetic_pages(total_games: int, games_per_day: int, per_page: int) -> List[str]:
+    """Pages de résultats au balisage MUI de play.spordle.com (en-têtes de date suivis de leur tableau)"""
+    # Menus, icônes et scripts qui alourdissent la vraie page sans contenir de match
+    chrome = ''.join(f'<div class="MuiListItem-root"><svg class="MuiSvgIcon-root"><path d="M{i} 0h24v24H0z"/></svg>'
+                     f'<span class="MuiTypography-root">Menu {i}</span></div>' for i in range(150))
+    pages = []
+    for first in range(0, total_games, per_page):
+        body = []
+        current_day = None
+        for index in range(first, min(first + per_page, total_games)):
+            day = SYNTHETIC_START + timedelta(days=index // games_per_day)
+            if day != current_day:
+                if current_day is not None:
+                    body.append('</tbody></table>')
+                header = day.strftime("%A, %B %-d, %Y")
+                body.append(f'<h6 class="MuiTypography-root MuiTypography-subtitle2">{header}</h6>')
+                body.append('<table class="MuiTable-root"><thead><tr class="MuiTableRow-root MuiTableRow-head">'
+                            '<th>#</th><th>Heure</th><th>Équipes</th><th>Terrain</th></tr></thead><tbody>')
+                current_day = day
+            body.append(_game_row(index))
+        body.append('</tbody></table>')
+        pages.append(f'<html><head><script>window.__APP__={{}}</script></head><body><nav>{chrome}</nav>'
+                     f'<main>{"".join(body)}</main></body></html>')
+    return pages
+
+def synthetic_scenarios() -> List[Scenario]:
+    return [
+        Scenario("petit", synthetic_pages(6, 2, 100), SYNTHETIC_START + timedelta(days=1)),
+        Scenario("25-lignes", synthetic_pages(25, 5, 25), SYNTHETIC_START + timedelta(days=3), per_page=25),
+        Scenario("400-lignes", synthetic_pages(400, 40, 100), SYNTHETIC_START + timedelta(days=8)),
+    ]
+
+def saved_scenario(path: Path, target: Optional[date]) -> Scenario:
+    """Page sauvegardée (ex. temp/spordle_games_debug.html) ; par défaut, première date ayant un tableau"""
+    html = path.read_text(encoding='utf-8')
+    if target is None:
+        dated = [s.date for s in parse_schedule_html(html).sections if s.date and s.has_table]
+        if not dated:
+            raise ValueError(f"Aucune date avec tableau dans {path}")
+        target = dated[0]
+    return Scenario(path.stem, [html], target)
+
+def _extractor(scenario: Scenario, driver: ReplayDriver) -> SpordleScheduleExtractor:
+    config = SpordleConfig()
+    config.per_page = scenario.per_page
+    config.max_pages = max(len(scenario.pages), 1)
+    config.games_table_timeout = 0
+    config.network_idle_timeout = 0
+    config.scrape_profile = False
+    extractor = SpordleScheduleExtractor(config)
+    extractor.driver = driver
+    extractor.readiness = PageReadiness(driver, poll_frequency=0.01)
+    return extractor
+
+def run_scenario(scenario: Scenario, repeat: int) -> ScenarioResult:
+    """Mesure l'analyse seule, puis get_matches() complet (temps médian, appels au driver, pic mémoire)"""
+    target = datetime.combine(scenario.target, datetime.min.time())
+
+    parse_times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        snapshots = [parse_schedule_html(page) for page in scenario.pages]
+        parse_times.append(time.perf_counter() - start)
+
+    extract_times = []
+    for _ in range(repeat):
+        driver = ReplayDriver(scenario.pages)
+        extractor = _extractor(scenario, driver)
+        start = time.perf_counter()
+        matches = extractor.get_matches(target)
+        extract_times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    _extractor(scenario, ReplayDriver(scenario.pages)).get_matches(target)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return ScenarioResult(
+        name=scenario.name,
+        pages=len(scenario.pages),
+        page_kb=round(sum(len(page) for page in scenario.pages) / 1024, 1),
+        rows=sum(snapshot.game_count for snapshot in snapshots),
+        matches=len(matches),
+        parse_ms=round(statistics.median(parse_times) * 1000, 3),
+        extract_ms=round(statistics.median(extract_times) * 1000, 3),
+        driver_calls=sum(driver.calls.values()),
+        peak_kb=round(peak / 1024, 1),
+    )
+
+def check_regressions(result: ScenarioResult, baseline: Dict, tolerance: float, slack_ms: float):
+    """Échec si les matchs extraits changent, si les appels au driver augmentent ou si le temps dépasse le seuil"""
+    if result.matches != baseline['matches']:
+        result.failures.append(f"matchs {result.matches} ≠ {baseline['matches']}")
+    if result.driver_calls > baseline['driver_calls']:
+        result.failures.append(f"appels driver {result.driver_calls} > {baseline['driver_calls']}")
+    for metric in ('parse_ms', 'extract_ms'):
+        limit = baseline[metric] * tolerance + slack_ms
+        if getattr(result, metric) > limit:
+            result.failures.append(f"{metric} {getattr(result, metric):.1f} > {limit:.1f}")
+
+def main() -> bool:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('pages', nargs='*', type=Path, help="pages HTML sauvegardées à rejouer en plus des pages synthétiques")
+    parser.add_argument('--date', type=date.fromisoformat, help="date recherchée dans les pages sauvegardées (AAAA-MM-JJ)")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--tolerance', type=float, default=float(os.getenv('BENCH_TOLERANCE', '1.5')),
+                        help="facteur maximal par rapport aux temps de référence")
+    parser.add_argument('--slack-ms', type=float, default=2.0, help="marge absolue ajoutée au seuil (bruit de mesure)")
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--output', type=Path, help="écrit les résultats en JSON")
+    args = parser.parse_args()
+
+    # Les journaux de get_matches() restent exécutés (leur coût fait partie de la mesure) mais ne sont pas affichés
+    logging.disable(logging.CRITICAL)
+    scenarios = synthetic_scenarios() + [saved_scenario(path, args.date) for path in args.pages]
+    results = [run_scenario(scenario, args.repeat) for scenario in scenarios]
+    logging.disable(logging.NOTSET)
+
+    baseline = json.loads(BASELINE_FILE.read_text(encoding='utf-8')) if BASELINE_FILE.exists() else {}
+    if not args.update_baseline:
+        for result in results:
+            if result.name in baseline:
+                check_regressions(result, baseline[result.name], args.tolerance, args.slack_ms)
+
+    print(f"{'scénario':<14}{'pages':>6}{'KB':>9}{'lignes':>8}{'matchs':>8}{'analyse ms':>12}{'extraction ms':>15}{'appels':>8}{'pic KB':>10}")
+    for r in results:
+        print(f"{r.name:<14}{r.pages:>6}{r.page_kb:>9.1f}{r.rows:>8}{r.matches:>8}{r.parse_ms:>12.2f}{r.extract_ms:>15.2f}{r.driver_calls:>8}{r.peak_kb:>10.1f}")
+        for failure in r.failures:
+            print(f"   ❌ {failure}")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps([r.__dict__ for r in results], indent=2, ensure_ascii=False), encoding='utf-8')
+
+    if args.update_baseline:
+        # Seules les pages synthétiques sont reproductibles d'une machine à l'autre
+        synthetic = {s.name for s in synthetic_scenarios()}
+        BASELINE_FILE.write_text(json.dumps(
+            {r.name: {'matches': r.matches, 'driver_calls': r.driver_calls, 'parse_ms': r.parse_ms, 'extract_ms': r.extract_ms}
+             for r in results if r.name in synthetic}, indent=2, ensure_ascii=False) + "\n", encoding='utf-8')
+        print(f"Référence mise à jour : {BASELINE_FILE}")
+        return True
+
+    return not any(r.failures for r in results)
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,150 @@
+"""
+Banc d'essai du rendu des cartes de l'horaire : gabarit à froid, carte d'une journée et semaine complète,
+avec des commanditaires synthétiques (reproductible, sans Facebook ni Spordle)
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from PIL import Image
+
+from models import Match
+from schedule_card import CardStyle, ScheduleCardRenderer
+
+BASELINE_FILE = Path(__file__).with_name('benchmark_rendering_baseline.json')
+
+# Semaine fixe : les cartes ne dépendent pas du jour de l'exécution
+SYNTHETIC_START = date(2025, 7, 5)
+
+HOME_TEAMS = ["TITANS 2 9UA", "TITANS 11UB", "TITANS 3 13UA"]
+AWAY_TEAMS = ["TOROS 3 9UB", "ROYAUX 1 11UA", "DIABLOS 13UB"]
+VENUES = ["Parc Ferland - Baseball 1", "Parc Chauveau - Baseball 2", "Terrain Duberger - Baseball"]
+
+@dataclass
+class RenderResult:
+    name: str
+    cards: int
+    kb: float
+    render_ms: float
+    peak_kb: float
+    failures: List[str] = field(default_factory=list)
+
+def synthetic_matches(count: int, day: date) -> List[Match]:
+    return [Match(
+        date=day.strftime("%A, %B %d, %Y"),
+        time=f"{9 + index % 12}:{'00' if index % 2 == 0 else '30'}",
+        home_team=HOME_TEAMS[index % len(HOME_TEAMS)],
+        away_team=AWAY_TEAMS[index % len(AWAY_TEAMS)],
+        venue=VENUES[index % len(VENUES)],
+        full_text=""
+    ) for index in range(count)]
+
+def synthetic_sponsors(folder: Path, count: int = 6):
+    """Logos de tailles variées (une photo de 3000 px, comme le fichier réel du club)"""
+    sizes = [(3000, 2500)] + [(600 + 80 * i, 300 + 40 * i) for i in range(count - 1)]
+    for index, size in enumerate(sizes):
+        Image.new('RGB', size, (40 * index % 255, 120, 200 - 20 * index)).save(folder / f"commanditaire_{index}.jpg", quality=90)
+
+def measure(func: Callable[[], List[bytes]], repeat: int):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        encoded = func()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return encoded, statistics.median(times), peak
+
+def run_scenarios(sponsor_folder: Path, repeat: int) -> List[RenderResult]:
+    warm = ScheduleCardRenderer(CardStyle(), str(sponsor_folder))
+    warm.template
+    week = {SYNTHETIC_START + timedelta(days=offset): synthetic_matches(3 + offset, SYNTHETIC_START + timedelta(days=offset))
+            for offset in range(7)}
+
+    def cold_template() -> List[bytes]:
+        # Fond, en-tête et bandeau des commanditaires (une fois par exécution, sinon lu du cache disque)
+        ScheduleCardRenderer(CardStyle(), str(sponsor_folder)).template
+        return []
+
+    scenarios = {
+        "gabarit": cold_template,
+        "carte-6": lambda: [warm.encode(warm.render(SYNTHETIC_START, synthetic_matches(6, SYNTHETIC_START)))],
+        "carte-12": lambda: [warm.encode(warm.render(SYNTHETIC_START, synthetic_matches(12, SYNTHETIC_START)))],
+        "semaine-7": lambda: [warm.encode(card) for card in warm.render_week(week).values()],
+    }
+    results = []
+    for name, func in scenarios.items():
+        encoded, median, peak = measure(func, repeat)
+        results.append(RenderResult(
+            name=name,
+            cards=len(encoded),
+            kb=round(sum(len(data) for data in encoded) / 1024, 1),
+            render_ms=round(median * 1000, 3),
+            peak_kb=round(peak / 1024, 1),
+        ))
+    return results
+
+def check_regressions(result: RenderResult, baseline: Dict, tolerance: float, slack_ms: float):
+    """Échec si le nombre de cartes change ou si le temps dépasse le seuil"""
+    if result.cards != baseline['cards']:
+        result.failures.append(f"cartes {result.cards} ≠ {baseline['cards']}")
+    limit = baseline['render_ms'] * tolerance + slack_ms
+    if result.render_ms > limit:
+        result.failures.append(f"render_ms {result.render_ms:.1f} > {limit:.1f}")
+
+def main() -> bool:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--tolerance', type=float, default=float(os.getenv('BENCH_TOLERANCE', '1.5')),
+                        help="facteur maximal par rapport aux temps de référence")
+    parser.add_argument('--slack-ms', type=float, default=5.0, help="marge absolue ajoutée au seuil (bruit de mesure)")
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--output', type=Path, help="écrit les résultats en JSON")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as folder:
+        synthetic_sponsors(Path(folder))
+        results = run_scenarios(Path(folder), args.repeat)
+    logging.disable(logging.NOTSET)
+
+    baseline = json.loads(BASELINE_FILE.read_text(encoding='utf-8')) if BASELINE_FILE.exists() else {}
+    if not args.update_baseline:
+        for result in results:
+            if result.name in baseline:
+                check_regressions(result, baseline[result.name], args.tolerance, args.slack_ms)
+
+    print(f"{'scénario':<12}{'cartes':>8}{'KB':>9}{'rendu ms':>11}{'pic KB':>10}")
+    for r in results:
+        print(f"{r.name:<12}{r.cards:>8}{r.kb:>9.1f}{r.render_ms:>11.2f}{r.peak_kb:>10.1f}")
+        for failure in r.failures:
+            print(f"   ❌ {failure}")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps([r.__dict__ for r in results], indent=2, ensure_ascii=False), encoding='utf-8')
+
+    if args.update_baseline:
+        BASELINE_FILE.write_text(json.dumps(
+            {r.name: {'cards': r.cards, 'render_ms': r.render_ms} for r in results}, indent=2, ensure_ascii=False
+        ) + "\n", encoding='utf-8')
+        print(f"Référence mise à jour : {BASELINE_FILE}")
+        return True
+
+    return not any(r.failures for r in results)
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
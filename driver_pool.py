@@ -0,0 +1,171 @@
+"""
+Pool de navigateurs Chrome authentifiés gardés au chaud pour des extractions successives (mode démon)
+"""
+
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from queue import Queue, Empty
+from typing import Optional
+
+from models import SpordleConfig
+from spordle_facebook import SpordleScheduleExtractor
+
+logger = logging.getLogger(__name__)
+
+class PooledExtractor:
+    """Extracteur Chrome connecté, avec son compteur d'utilisations et sa mémoire de départ"""
+
+    def __init__(self, extractor: SpordleScheduleExtractor):
+        self.extractor = extractor
+        self.uses = 0
+        self.baseline_memory: Optional[float] = None
+
+class DriverPool:
+    """Garde des instances Chrome connectées et les recycle après N utilisations ou une hausse de mémoire"""
+
+    # Mémoire JS de la page (Chrome seulement), en octets
+    _MEMORY_SCRIPT = "return (performance.memory && performance.memory.usedJSHeapSize) || null;"
+
+    def __init__(self, config: SpordleConfig, size: int = 1, max_uses: int = 50, max_memory_growth_mb: float = 300):
+        self.config = config
+        self.size = size
+        self.max_uses = max_uses
+        self.max_memory_growth = max_memory_growth_mb * 1024 * 1024
+        self.idle: Queue = Queue()
+        self.created = 0
+        self.lock = threading.Lock()
+
+    def _start(self) -> PooledExtractor:
+        """Démarre et connecte une nouvelle instance Chrome"""
+        extractor = SpordleScheduleExtractor(self.config)
+        if not extractor.start_driver() or not extractor.login():
+            extractor.close()
+            raise RuntimeError("Impossible de démarrer une instance Chrome connectée")
+        pooled = PooledExtractor(extractor)
+        pooled.baseline_memory = self._memory(pooled)
+        logger.info("Nouvelle instance Chrome ajoutée au pool")
+        return pooled
+
+    def _memory(self, pooled: PooledExtractor) -> Optional[float]:
+        try:
+            return pooled.extractor.driver.execute_script(self._MEMORY_SCRIPT)
+        except Exception:
+            return None
+
+    def _healthy(self, pooled: PooledExtractor) -> bool:
+        """Vérifie que le navigateur répond encore et n'a pas atteint ses limites"""
+        if pooled.uses >= self.max_uses:
+            logger.info(f"Instance Chrome recyclée après {pooled.uses} utilisations")
+            return False
+        try:
+            pooled.extractor.driver.execute_script("return 1;")
+            if SpordleScheduleExtractor._session_state(pooled.extractor.driver) == 'rejected':
+                logger.info("Session Spordle expirée, recyclage de l'instance Chrome")
+                return False
+        except Exception as e:
+            logger.warning(f"Instance Chrome ne répond plus, recyclage : {e}")
+            return False
+        memory = self._memory(pooled)
+        if memory and pooled.baseline_memory and memory - pooled.baseline_memory > self.max_memory_growth:
+            logger.info(f"Instance Chrome recyclée : mémoire +{(memory - pooled.baseline_memory) / 1024 / 1024:.0f} MB")
+            return False
+        return True
+
+    def _discard(self, pooled: PooledExtractor):
+        pooled.extractor.close()
+        with self.lock:
+            self.created -= 1
+
+    @contextmanager
+    def acquire(self, timeout: float = 300):
+        """Prête une instance connectée (démarrée au besoin) et la remet dans le pool après usage"""
+        pooled = None
+        while pooled is None:
+            try:
+                pooled = self.idle.get_nowait()
+            except Empty:
+                with self.lock:
+                    can_create = self.created < self.size
+                    if can_create:
+                        self.created += 1
+                if can_create:
+                    try:
+                        pooled = self._start()
+                    except Exception:
+                        with self.lock:
+                            self.created -= 1
+                        raise
+                else:
+                    pooled = self.idle.get(timeout=timeout)
+
+            if not self._healthy(pooled):
+                self._discard(pooled)
+                pooled = None
+
+        failed = False
+        try:
+            yield pooled.extractor
+        except Exception:
+            failed = True
+            raise
+        finally:
+            pooled.uses += 1
+            if failed:
+                self._discard(pooled)
+            else:
+                self.idle.put(pooled)
+
+    def close(self):
+        """Ferme toutes les instances inactives"""
+        while True:
+            try:
+                self._discard(self.idle.get_nowait())
+            except Empty:
+                break
+
+def run_daemon(interval_minutes: float, days_ahead: int):
+    """Rafraîchit le cache de l'horaire en boucle en réutilisant le même Chrome"""
+    from schedule_cache import ScheduleCache
+
+    config = SpordleConfig()
+    pool = DriverPool(
+        config,
+        size=int(os.getenv('DRIVER_POOL_SIZE', '1')),
+        max_uses=int(os.getenv('DRIVER_MAX_USES', '50')),
+        max_memory_growth_mb=float(os.getenv('DRIVER_MAX_MEMORY_GROWTH_MB', '300'))
+    )
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    logger.info(f"=== MODE DÉMON : rafraîchissement toutes les {interval_minutes} minute(s) ===")
+    try:
+        while not stop.is_set():
+            start = time.perf_counter()
+            cache = ScheduleCache(config.schedule_cache_file)
+            try:
+                with pool.acquire() as extractor:
+                    # max_age_hours=0 : chaque cycle relit toute la fenêtre
+                    cache.refresh(extractor, datetime.now().date(), days_ahead, max_age_hours=0)
+            except Exception as e:
+                logger.error(f"Cycle d'extraction échoué : {e}")
+            finally:
+                cache.close()
+            logger.info(f"⏱️ Cycle terminé en {time.perf_counter() - start:.1f}s")
+            stop.wait(interval_minutes * 60)
+    finally:
+        pool.close()
+        logger.info("Mode démon arrêté")
+
+if __name__ == "__main__":
+    run_daemon(
+        interval_minutes=float(os.getenv('DAEMON_INTERVAL_MINUTES', '5')),
+        days_ahead=int(os.getenv('DAEMON_DAYS_AHEAD', '7'))
+    )
+    sys.exit(0)
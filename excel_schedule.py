@@ -0,0 +1,184 @@
+"""
+Lecture de l'horaire Excel exporté de Spordle (horraire.xlsx), sans ImportExcel ni Windows
+
+Les colonnes utiles sont lues une seule fois (lecture en continu) dans des tableaux typés triés par date ;
+les matchs d'une journée sont retrouvés par recherche dichotomique.
+"""
+
+import logging
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, date, time as dt_time, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from normalize import canonical_teams
+from models import Match, SpordleConfig
+
+logger = logging.getLogger(__name__)
+
+# Origine des dates Excel (fractions de jour)
+EXCEL_EPOCH = datetime(1899, 12, 30)
+
+DATE_COLUMN = 'Date'
+TIME_COLUMN = 'Start Time'
+HOME_COLUMN = 'Home Team Name'
+AWAY_COLUMN = 'Away Team Name'
+VENUE_COLUMN = 'Venue'
+NUMBER_COLUMN = 'Game Number'
+
+def _to_date(value) -> Optional[date]:
+    """Cellule Date : datetime (openpyxl), numéro de série Excel ou texte ISO"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, (int, float)):
+        return (EXCEL_EPOCH + timedelta(days=value)).date()
+    if isinstance(value, str) and value.strip():
+        try:
+            return datetime.fromisoformat(value.strip()[:10]).date()
+        except ValueError:
+            return None
+    return None
+
+def _to_minutes(value) -> int:
+    """Cellule Start Time en minutes depuis minuit (-1 si inconnue)"""
+    if isinstance(value, (dt_time, datetime)):
+        return value.hour * 60 + value.minute
+    if isinstance(value, (int, float)):
+        # Fraction de jour (arrondie à la minute)
+        return round((value % 1) * 24 * 60) % (24 * 60)
+    if isinstance(value, str) and ':' in value:
+        hours, minutes = value.strip().split(':')[:2]
+        try:
+            return int(hours) * 60 + int(minutes[:2])
+        except ValueError:
+            return -1
+    return -1
+
+class ExcelSchedule:
+    """Colonnes de l'horaire triées par (date, heure), indexées par date"""
+
+    def __init__(self, days: array, minutes: array, home_teams: List[str], away_teams: List[str],
+                 venues: List[str], numbers: List[str]):
+        self.days = days  # date.toordinal()
+        self.minutes = minutes
+        self.home_teams = home_teams
+        self.away_teams = away_teams
+        self.venues = venues
+        self.numbers = numbers
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    @classmethod
+    def load(cls, path: str, sheet: Optional[str] = None) -> 'ExcelSchedule':
+        """Lit le classeur en mode lecture seule (en continu) et convertit chaque colonne une seule fois"""
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            raise RuntimeError("Module openpyxl requis pour lire l'horaire Excel (pip install openpyxl)")
+
+        start = time.perf_counter()
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            worksheet = workbook[sheet] if sheet else workbook.worksheets[0]
+            rows = worksheet.iter_rows(values_only=True)
+            header = [str(cell).strip() if cell is not None else '' for cell in next(rows, ())]
+            missing = [c for c in (DATE_COLUMN, TIME_COLUMN, HOME_COLUMN, AWAY_COLUMN, VENUE_COLUMN) if c not in header]
+            if missing:
+                raise ValueError(f"Colonnes absentes de {path} : {', '.join(missing)}")
+            index = {name: header.index(name) for name in header if name}
+            number_index = index.get(NUMBER_COLUMN)
+
+            records = []
+            for row in rows:
+                day = _to_date(row[index[DATE_COLUMN]])
+                if day is None:
+                    continue
+                records.append((
+                    day.toordinal(),
+                    _to_minutes(row[index[TIME_COLUMN]]),
+                    str(row[index[HOME_COLUMN]] or ''),
+                    str(row[index[AWAY_COLUMN]] or ''),
+                    str(row[index[VENUE_COLUMN]] or ''),
+                    str(row[number_index] or '') if number_index is not None else '',
+                ))
+        finally:
+            workbook.close()
+
+        records.sort(key=lambda record: (record[0], record[1]))
+        columns = list(zip(*records)) if records else [()] * 6
+        schedule = cls(
+            days=array('l', columns[0]),
+            minutes=array('h', columns[1]),
+            home_teams=canonical_teams(columns[2]),
+            away_teams=canonical_teams(columns[3]),
+            venues=list(columns[4]),
+            numbers=list(columns[5]),
+        )
+        logger.info(f"Horaire Excel chargé : {len(schedule)} match(s) en {time.perf_counter() - start:.2f}s ({path})")
+        return schedule
+
+    def _match(self, position: int, day: date) -> Match:
+        minutes = self.minutes[position]
+        return Match(
+            date=day.strftime("%A, %B %d, %Y"),
+            time=f"{minutes // 60:02d}:{minutes % 60:02d}" if minutes >= 0 else "Inconnu",
+            home_team=self.home_teams[position],
+            away_team=self.away_teams[position],
+            venue=self.venues[position],
+            full_text=self.numbers[position],
+            test_mode=(day != date.today())
+        )
+
+    def positions(self, start: date, end: date) -> range:
+        """Positions des matchs entre deux dates (incluses) : O(log n)"""
+        return range(bisect_left(self.days, start.toordinal()), bisect_right(self.days, end.toordinal()))
+
+    def iter_matches(self, start: date, end: date) -> Iterator[Match]:
+        """Matchs entre deux dates (incluses), triés par date et heure"""
+        for position in self.positions(start, end):
+            yield self._match(position, date.fromordinal(self.days[position]))
+
+    def matches_on(self, day: date) -> List[Match]:
+        return list(self.iter_matches(day, day))
+
+class ExcelScheduleExtractor:
+    """Source Excel avec la même interface que SpordleScheduleExtractor"""
+
+    def __init__(self, config: SpordleConfig):
+        self.config = config
+        self.schedule: Optional[ExcelSchedule] = None
+
+    def start_driver(self) -> bool:
+        """Aucun navigateur : le classeur est lu une seule fois"""
+        if not Path(self.config.excel_file).exists():
+            logger.error(f"Horaire Excel introuvable : {self.config.excel_file}")
+            return False
+        self.schedule = ExcelSchedule.load(self.config.excel_file)
+        return True
+
+    def login(self) -> bool:
+        return True
+
+    def get_matches(self, test_date: Optional[datetime] = None) -> List[Match]:
+        if test_date is None:
+            test_date = datetime.now()
+        return self.schedule.matches_on(test_date.date())
+
+    def get_matches_range(self, start: date, end: date) -> Dict[date, List[Match]]:
+        matches_by_date: Dict[date, List[Match]] = {}
+        day = start
+        while day <= end:
+            matches_by_date[day] = []
+            day += timedelta(days=1)
+        for position in self.schedule.positions(start, end):
+            day = date.fromordinal(self.schedule.days[position])
+            matches_by_date[day].append(self.schedule._match(position, day))
+        return matches_by_date
+
+    def close(self):
+        self.schedule = None
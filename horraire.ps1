@@ -113,6 +113,28 @@ function Resize-Image {
     }
 }
 
+# Fonction pour normaliser une colonne de noms ("TITANS 2 - 9U - A - ..." -> "TITANS 2 9UA") via normalize.py
+function Get-CanonicalNames {
+    param (
+        [string]$Kind,  # "team" ou "venue"
+        [object[]]$Values
+    )
+
+    $names = @{}
+    $unique = @($Values | ForEach-Object { [string]$_ } | Where-Object { $_ } | Select-Object -Unique)
+    if ($unique.Count -eq 0) {
+        return $names
+    }
+
+    $OutputEncoding = [System.Text.Encoding]::UTF8
+    [Console]::OutputEncoding = [System.Text.Encoding]::UTF8
+    $normalized = @($unique | python (Join-Path $scriptDir "normalize.py") $Kind)
+    for ($i = 0; $i -lt $unique.Count; $i++) {
+        $names[$unique[$i]] = $normalized[$i]
+    }
+    return $names
+}
+
 # Importer le module ImportExcel
 Import-Module ImportExcel
 
@@ -154,6 +176,10 @@ if ($matchesToday) {
     $tableHeader = "⚾ Matchs de la journée ($currentDate) ⚾`n`n"
     $tableContent = ""
 
+    # Normaliser les noms en un seul appel par colonne (même module que spordle_facebook.py)
+    $teamNames = Get-CanonicalNames -Kind "team" -Values (@($matchesToday.'Home Team Name') + @($matchesToday.'Away Team Name'))
+    $venueNames = Get-CanonicalNames -Kind "venue" -Values @($matchesToday.Venue)
+
     foreach ($match in $matchesToday) {
         $startTime = try { 
             $startTimeValue = $match.'Start Time'
@@ -169,57 +195,10 @@ if ($matchesToday) {
             Write-Warning "Erreur de conversion pour Start Time '$startTimeValue' : $_"
             "Inconnu"  # Valeur par défaut en cas d'erreur
         }
-        $fullHomeTeam = $match."Home Team Name"
-        $fullAwayTeam = $match."Away Team Name"
-        
-        # Log des noms complets pour vérification
-        Write-Output "Nom brut (Home Team) : '$fullHomeTeam'"
-        Write-Output "Nom brut (Away Team) : '$fullAwayTeam'"
-
-        # Normaliser le délimiteur : remplacer les tirets entourés d'espaces par un tiret simple
-        $normalizedHomeTeam = $fullHomeTeam -replace '\s*-\s*', '-'
-        $normalizedAwayTeam = $fullAwayTeam -replace '\s*-\s*', '-'
-
-        # Log des noms après normalisation
-        Write-Output "Nom normalisé (Home Team) : '$normalizedHomeTeam'"
-        Write-Output "Nom normalisé (Away Team) : '$normalizedAwayTeam'"
-
-        # Extraire les trois premières parties du nom
-        $homeTeamParts = $normalizedHomeTeam.Split('-') | Select-Object -First 3
-        $awayTeamParts = $normalizedAwayTeam.Split('-') | Select-Object -First 3
-
-        # Log des parties pour vérification
-        Write-Output "Parties (Home Team) : $($homeTeamParts -join ', ')"
-        Write-Output "Parties (Away Team) : $($awayTeamParts -join ', ')"
-
-        # Recombiner les parties dans le nouveau format : "TITANS 2 9UA"
-        if ($homeTeamParts.Length -eq 3) {
-            $homeTeamBase = $homeTeamParts[0]  # Ex: "TITANS 2" (déjà correct, car il y a un espace dans le nom)
-            $homeTeamLevelAndCategory = $homeTeamParts[1] + $homeTeamParts[2]  # Ex: "9UA"
-            $homeTeam = "$homeTeamBase $homeTeamLevelAndCategory"  # Ex: "TITANS 2 9UA"
-        } else {
-            $homeTeam = $homeTeamParts -join " "  # Cas où il n'y a pas assez de parties
-        }
-
-        if ($awayTeamParts.Length -eq 3) {
-            $awayTeamBase = $awayTeamParts[0]  # Ex: "CARDINALS 1" (déjà correct, car il y a un espace dans le nom)
-            $awayTeamLevelAndCategory = $awayTeamParts[1] + $awayTeamParts[2]  # Ex: "9UA"
-            $awayTeam = "$awayTeamBase $awayTeamLevelAndCategory"  # Ex: "CARDINALS 1 9UA"
-        } else {
-            $awayTeam = $awayTeamParts -join " "  # Cas où il n'y a pas assez de parties
-        }
-        
-        # Log des noms après traitement
-        Write-Output "Nom affiché (Home Team) : '$homeTeam'"
-        Write-Output "Nom affiché (Away Team) : '$awayTeam'"
-
-        # Nettoyer le nom du lieu (Venue) : supprimer " - Baseball" et tout ce qui suit
-        $venue = $match.Venue
-        Write-Output "Lieu brut : '$venue'"
-        if ($venue -match " - Baseball") {
-            $venue = $venue -replace " - Baseball.*$", ""
-        }
-        Write-Output "Lieu nettoyé : '$venue'"
+        $homeTeam = $teamNames[[string]$match."Home Team Name"]
+        $awayTeam = $teamNames[[string]$match."Away Team Name"]
+        $venue = $venueNames[[string]$match.Venue]
+        Write-Output "Match : '$homeTeam' vs '$awayTeam' ($venue)"
 
         $tableContent += "⏰ $startTime  $homeTeam  vs  $awayTeam  🏟️ $venue`n"
     }
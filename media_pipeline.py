@@ -0,0 +1,77 @@
+"""
+Préparation des images des commanditaires en parallèle de l'extraction
+
+Le rendu et l'envoi des photos non publiées (published=false) ne dépendent pas de l'horaire : ils démarrent
+avec Chrome/l'API et sont rejoints au moment de publier. Durée totale ≈ max(extraction, images).
+"""
+
+import logging
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Dict, List, Optional
+
+from retry_policy import run_deadline
+from run_report import report
+
+logger = logging.getLogger(__name__)
+
+class SponsorMediaPipeline:
+    """Rend et envoie les images non publiées dans un thread ; les envois inutilisés sont supprimés à la fermeture"""
+
+    def __init__(self, publisher):
+        self.publisher = publisher
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sponsor-media')
+        self.future = None
+        self.taken = False
+        self.cancelled = threading.Event()
+
+    def start(self) -> 'SponsorMediaPipeline':
+        logger.info("🖼️ Préparation des images des commanditaires en parallèle de l'extraction")
+        self.future = self.executor.submit(self._prepare)
+        return self
+
+    def _prepare(self) -> List[Dict]:
+        with report.span('media_pipeline') as attrs:
+            images = self.publisher._prepare_sponsor_images()
+            if self.cancelled.is_set():
+                # Aucun match entre-temps : rien à envoyer
+                attrs['cancelled'] = True
+                return []
+            attached_media = self.publisher._upload_sponsor_images(images[:self.publisher.MAX_BATCH_SIZE - 1]) if images else []
+            attrs.update(images=len(images), uploaded=len(attached_media))
+            return attached_media
+
+    def take(self, timeout: Optional[float] = None) -> Optional[List[Dict]]:
+        """Images envoyées (attached_media), en attendant au plus timeout secondes ; None si indisponibles"""
+        start = time.perf_counter()
+        if timeout == math.inf:
+            timeout = None
+        try:
+            attached_media = self.future.result(timeout=timeout)
+        except FutureTimeout:
+            logger.warning(f"Images des commanditaires non prêtes après {timeout:.0f}s")
+            return None
+        except Exception as e:
+            logger.warning(f"Préparation des images en parallèle échouée : {e}")
+            return None
+        self.taken = True
+        logger.info(f"⏱️ Images prêtes ({len(attached_media)} envoyée(s)) après {time.perf_counter() - start:.2f}s d'attente")
+        return attached_media
+
+    def close(self):
+        """Supprime les photos envoyées mais jamais rattachées à un post (aucun match, horaire déjà publié...)"""
+        if self.future is not None and not self.taken:
+            # Un rendu en cours s'arrête avant l'envoi ; un envoi en cours est attendu puis supprimé
+            self.cancelled.set()
+            remaining = run_deadline.stage_remaining()
+            try:
+                unused = self.future.result(timeout=None if remaining == math.inf else remaining)
+            except Exception as e:
+                logger.warning(f"Images envoyées non supprimées : {e}")
+                unused = []
+            if unused:
+                logger.info(f"Suppression de {len(unused)} image(s) envoyée(s) inutilisée(s)")
+                self.publisher._delete_photos(unused)
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,170 @@
+"""
+Modèles partagés (match, image de commanditaire) et configuration Spordle/Facebook
+
+Module sans effet de bord : les modules d'extraction et de publication l'importent sans charger
+spordle_facebook (qui serait sinon chargé une seconde fois lorsqu'il est exécuté comme script).
+"""
+
+import json
+import logging
+import mimetypes
+import os
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import quote
+
+from retry_policy import RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+# Extension de fichier par format d'encodage des images
+IMAGE_EXTENSIONS = {'JPEG': 'jpg', 'PNG': 'png', 'WEBP': 'webp'}
+
+@dataclass
+class Match:
+    """Représente un match de baseball"""
+    date: str
+    time: str
+    home_team: str
+    away_team: str
+    venue: str
+    full_text: str
+    test_mode: bool = False
+
+@dataclass
+class SponsorImage:
+    """Image de commanditaire encodée en mémoire, prête à l'envoi"""
+    name: str
+    data: bytes
+    format: str
+    cache_path: Optional[str] = None
+    
+    @property
+    def filename(self) -> str:
+        return f"{self.name}.{IMAGE_EXTENSIONS[self.format]}"
+    
+    @property
+    def mime_type(self) -> str:
+        return mimetypes.guess_type(self.filename)[0] or 'application/octet-stream'
+
+class SpordleConfig:
+    """Configuration pour Spordle"""
+    def __init__(self, office_id: Optional[int] = None, require_password: bool = True):
+        self.login_url = "https://myaccount.spordle.com/login?c=play&identity=0c74c85b-ba18-41f7-b170-e7b0dd3f4719&r=https%3A%2F%2Fplay.spordle.com%2Flogin%3Fu%3Dgunadeau%40hotmail.com&link=1"
+        self.password = os.getenv('SPORDLE_PASS')
+        
+        # Bureau (homeTeamOffices) et saison filtrés dans la liste des matchs
+        self.office_id = office_id or int(os.getenv('SPORDLE_OFFICE_ID', '3784'))
+        self.season_id = os.getenv('SPORDLE_SEASON_ID', '2025-26')
+        games_filter = quote(json.dumps(
+            {"_include": ["gameBracket"], "homeTeamOffices": [self.office_id], "seasonId": self.season_id},
+            separators=(',', ':')
+        ))
+        self.games_url_template = f"https://play.spordle.com/games?filter={games_filter}&order=ASC&order=ASC&order=ASC&page={{page}}&perPage={{per_page}}&sort=date&sort=startTime&sort=number"
+        
+        # Pagination : plus de matchs par page pour couvrir les fins de semaine de tournoi
+        self.per_page = int(os.getenv('SPORDLE_PER_PAGE', '100'))
+        self.max_pages = int(os.getenv('SPORDLE_MAX_PAGES', '10'))
+        self.games_url = self.games_page_url(1)
+        
+        # Plafonds d'attente (secondes) pour les signaux de disponibilité de la page
+        self.login_form_timeout = float(os.getenv('SPORDLE_LOGIN_FORM_TIMEOUT', '15'))
+        self.login_redirect_timeout = float(os.getenv('SPORDLE_LOGIN_REDIRECT_TIMEOUT', '20'))
+        self.games_table_timeout = float(os.getenv('SPORDLE_GAMES_TABLE_TIMEOUT', '20'))
+        self.network_idle_timeout = float(os.getenv('SPORDLE_NETWORK_IDLE_TIMEOUT', '5'))
+        self.page_load_timeout = float(os.getenv('SPORDLE_PAGE_LOAD_TIMEOUT', '60'))
+        
+        # API JSON alimentant le front React (mode sans navigateur)
+        self.fetch_mode = os.getenv('SPORDLE_FETCH_MODE', 'auto').lower()  # auto | api | browser | excel
+        self.api_url = os.getenv('SPORDLE_API_URL', 'https://api.hisports.app/api')
+        self.api_token = os.getenv('SPORDLE_API_TOKEN')
+        
+        # Horaire exporté en Excel (SPORDLE_FETCH_MODE=excel)
+        self.excel_file = os.getenv('EXCEL_SCHEDULE_FILE', 'horraire.xlsx')
+        
+        # Session persistée (chiffrée) pour éviter la connexion à chaque exécution
+        self.session_file = os.getenv('SPORDLE_SESSION_FILE', '.cache/spordle_session.bin')
+        self.session_secret = os.getenv('SPORDLE_SESSION_KEY') or self.password
+        
+        # Profil de navigation allégé (blocage images/polices/statistiques, chargement "eager")
+        self.scrape_profile = os.getenv('SPORDLE_SCRAPE_PROFILE', '1') != '0'
+        
+        # Diagnostics coûteux (balayages regex de tout le HTML, liste des dates)
+        self.debug = os.getenv('SPORDLE_DEBUG', '0') == '1'
+        
+        # Vérifications rapides avant toute extraction : saison (MM-JJ:MM-JJ) et âge maximal du cache
+        self.season_window = os.getenv('SPORDLE_SEASON_WINDOW', '')
+        self.schedule_cache_max_age = float(os.getenv('SCHEDULE_CACHE_MAX_AGE_HOURS', '12'))
+        
+        # Cache local de l'horaire (SQLite)
+        self.schedule_cache_file = os.getenv('SCHEDULE_CACHE_FILE', '.cache/schedule.sqlite3')
+        
+        # Nouvelles tentatives (pages, API) et temps minimal pour lancer Chrome en repli
+        self.retry_policy = RetryPolicy(attempts=int(os.getenv('RETRY_ATTEMPTS', '3')))
+        self.browser_min_seconds = float(os.getenv('BROWSER_MIN_SECONDS', '90'))
+        
+        # L'horaire Excel ne se connecte jamais à Spordle : aucun mot de passe requis
+        if self.fetch_mode == 'excel':
+            require_password = False
+        if require_password and not self.password:
+            raise ValueError("Variable d'environnement SPORDLE_PASS non définie")
+    
+    def games_page_url(self, page: int) -> str:
+        """URL d'une page de résultats de la liste des matchs"""
+        return self.games_url_template.format(page=page, per_page=self.per_page)
+
+class FacebookConfig:
+    """Configuration pour Facebook"""
+    def __init__(self, page_id: Optional[str] = None, access_token: Optional[str] = None,
+                 sponsor_folder: Optional[str] = None, intro_message: Optional[str] = None,
+                 require_credentials: bool = True):
+        self.page_id = page_id or os.getenv('FACEBOOK_PAGE_ID')
+        self.access_token = access_token or os.getenv('FACEBOOK_ACCESS_TOKEN')
+        self.photo_api_url = f"https://graph.facebook.com/v22.0/{self.page_id}/photos"
+        self.feed_api_url = f"https://graph.facebook.com/v22.0/{self.page_id}/feed"
+        self.graph_api_url = "https://graph.facebook.com/v22.0/"
+        
+        # Cache des images de commanditaires redimensionnées (SPONSOR_CACHE_DIR vide = tout en mémoire)
+        self.sponsor_cache_dir = os.getenv('SPONSOR_CACHE_DIR', '.cache/sponsor_images')
+        self.sponsor_cache_max_bytes = int(float(os.getenv('SPONSOR_CACHE_MAX_MB', '50')) * 1024 * 1024)
+        
+        # Encodage des images : budget par image et formats permis (JPEG, PNG, WEBP)
+        self.image_budget = int(float(os.getenv('SPONSOR_IMAGE_MAX_KB', '300')) * 1024)
+        formats = [f.strip().upper() for f in os.getenv('SPONSOR_IMAGE_FORMATS', 'JPEG,PNG').split(',') if f.strip()]
+        self.image_formats = tuple(f for f in formats if f in IMAGE_EXTENSIONS)
+        if len(self.image_formats) != len(formats) or not self.image_formats:
+            ignored = [f for f in formats if f not in IMAGE_EXTENSIONS]
+            self.image_formats = self.image_formats or ('PNG',)
+            logger.warning(f"SPONSOR_IMAGE_FORMATS : formats ignorés {ignored} - formats retenus {list(self.image_formats)}")
+        
+        # Parallélisme du traitement et de l'envoi des images
+        self.render_workers = int(os.getenv('SPONSOR_RENDER_WORKERS', str(os.cpu_count() or 1)))
+        self.upload_concurrency = int(os.getenv('FACEBOOK_UPLOAD_CONCURRENCY', '4'))
+        # Images rendues et envoyées (non publiées) pendant l'extraction plutôt qu'après
+        self.media_pipeline = os.getenv('SPONSOR_MEDIA_PIPELINE', '1') != '0'
+        
+        # Appels Graph : délai par requête, nouvelles tentatives (un POST expiré en lecture n'est pas rejoué)
+        # et temps minimal pour joindre les images (sinon publication du texte seul)
+        self.graph_timeout = float(os.getenv('FACEBOOK_TIMEOUT', '60'))
+        self.retry_policy = RetryPolicy(attempts=int(os.getenv('RETRY_ATTEMPTS', '3')), idempotent=False)
+        self.images_min_seconds = float(os.getenv('IMAGES_MIN_SECONDS', '60'))
+        
+        # Carte image de l'horaire jointe en premier au post (SCHEDULE_CARD=1), aux couleurs du club ;
+        # son gabarit (fond, polices, commanditaires) est gardé dans CARD_CACHE_DIR
+        self.schedule_card = os.getenv('SCHEDULE_CARD', '0') == '1'
+        self.card_title = os.getenv('CARD_TITLE', 'TITANS')
+        self.card_background = os.getenv('CARD_BACKGROUND', '#0b1f3a')
+        self.card_accent = os.getenv('CARD_ACCENT', '#f2b705')
+        self.card_font = os.getenv('CARD_FONT')
+        self.card_bold_font = os.getenv('CARD_BOLD_FONT')
+        self.card_cache_dir = os.getenv('CARD_CACHE_DIR', '.cache/schedule_cards')
+        
+        # Registre des publications (reprise après échec, aucun doublon pour un horaire identique)
+        self.ledger_file = os.getenv('PUBLISH_LEDGER_FILE', '.cache/publish_ledger.sqlite3')
+        
+        # Contenu propre à chaque club : dossier des commanditaires et introduction du message
+        self.sponsor_folder = sponsor_folder or os.getenv('SPONSOR_FOLDER', 'Commanditaire')
+        self.intro_message = intro_message or "Venez encourager nos Titans ! Voici les matchs de la journée sur nos terrains:"
+        
+        if require_credentials and (not self.page_id or not self.access_token):
+            raise ValueError("Variables d'environnement FACEBOOK_PAGE_ID ou FACEBOOK_ACCESS_TOKEN non définies")
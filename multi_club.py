@@ -0,0 +1,248 @@
+"""
+Publication multi-clubs : une extraction et une publication par bureau Spordle, en parallèle
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional
+
+import requests
+
+from media_pipeline import SponsorMediaPipeline
+from models import FacebookConfig, Match, SpordleConfig
+from retry_policy import run_deadline
+from run_report import report
+from spordle_facebook import FacebookPublisher, nothing_to_do, reconcile_with_cache, run_extraction
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ClubConfig:
+    """Un club : bureau Spordle (homeTeamOffices) publié sur une page Facebook"""
+    name: str
+    office_id: int
+    page_id: str
+    access_token: str
+    sponsor_folder: str = "Commanditaire"
+    intro_message: Optional[str] = None
+
+@dataclass
+class ClubResult:
+    """Résultat de l'extraction et de la publication d'un club"""
+    name: str
+    matches: Optional[int] = None
+    published: bool = False
+    error: Optional[str] = None
+    skipped: Optional[str] = None  # raison de ne rien faire (hors saison, journée vide)
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        # Aucun match ce jour-là (ou rien à faire) n'est pas une erreur en mode multi-clubs
+        if self.error is not None:
+            return False
+        return self.skipped is not None or (self.matches is not None and (self.published or self.matches == 0))
+
+def load_clubs(path: str) -> List[ClubConfig]:
+    """Lit la liste des clubs (JSON) ; les jetons Facebook sont lus dans les variables nommées par access_token_env"""
+    entries = json.loads(Path(path).read_text(encoding='utf-8'))
+    clubs = []
+    for entry in entries:
+        token_env = entry.get('access_token_env', 'FACEBOOK_ACCESS_TOKEN')
+        token = os.getenv(token_env)
+        if not token:
+            raise ValueError(f"Club {entry.get('name')}: variable d'environnement {token_env} non définie")
+        clubs.append(ClubConfig(
+            name=entry['name'],
+            office_id=int(entry['office_id']),
+            page_id=str(entry['page_id']),
+            access_token=token,
+            sponsor_folder=entry.get('sponsor_folder', 'Commanditaire'),
+            intro_message=entry.get('intro_message'),
+        ))
+    return clubs
+
+class MultiClubRunner:
+    """Extrait et publie l'horaire de plusieurs clubs dans un pool de threads borné"""
+
+    def __init__(self, clubs: List[ClubConfig], workers: int = 4, browser_workers: int = 2):
+        self.clubs = clubs
+        self.workers = max(1, min(workers, len(clubs)))
+        self.browser_workers = browser_workers
+        self.base_config = SpordleConfig()
+        self.api_client = None
+        self.driver_pool = None
+        self.pool_lock = threading.Lock()
+
+    def _club_config(self, club: ClubConfig) -> SpordleConfig:
+        config = SpordleConfig(office_id=club.office_id)
+        # Un cache d'horaire par bureau : les dates ne sont pas partagées entre clubs
+        cache_path = Path(config.schedule_cache_file)
+        config.schedule_cache_file = str(cache_path.with_name(f"{cache_path.stem}_{club.office_id}{cache_path.suffix}"))
+        return config
+
+    def _login_api(self) -> bool:
+        """Authentifie une seule fois le client API partagé par tous les clubs"""
+        if self.base_config.fetch_mode not in ('auto', 'api'):
+            return False
+        from spordle_api import SpordleApiClient, SpordleApiExtractor
+        self.api_client = SpordleApiClient(self.base_config.api_url, pool_maxsize=self.workers,
+                                            retry_policy=self.base_config.retry_policy)
+        if SpordleApiExtractor(self.base_config, self.api_client).login():
+            return True
+        self.api_client.close()
+        self.api_client = None
+        return False
+
+    def _fetch_api(self, config: SpordleConfig, test_date: datetime) -> Optional[List[Match]]:
+        from spordle_api import SpordleApiExtractor, SpordleApiError
+        try:
+            return run_extraction(SpordleApiExtractor(config, self.api_client), test_date)
+        except (SpordleApiError, requests.RequestException, ValueError) as e:
+            logger.warning(f"Échec du mode API Spordle (bureau {config.office_id}) : {e}")
+            return None
+
+    def _fetch_browser(self, config: SpordleConfig, test_date: datetime) -> Optional[List[Match]]:
+        """Extraction via Chrome : les instances connectées sont partagées par les clubs"""
+        from driver_pool import DriverPool
+        with self.pool_lock:
+            if self.driver_pool is None:
+                self.driver_pool = DriverPool(self.base_config, size=self.browser_workers)
+        try:
+            with self.driver_pool.acquire() as extractor:
+                # L'instance reste connectée ; seul le filtre du bureau change le temps de l'extraction.
+                # La page déjà affichée (restauration de session, club précédent) est celle d'un autre bureau
+                extractor.config = config
+                extractor.games_page_loaded = False
+                try:
+                    return extractor.get_matches(test_date)
+                finally:
+                    extractor.config = self.base_config
+                    extractor.games_page_loaded = False
+        except Exception as e:
+            logger.error(f"Extraction Chrome échouée (bureau {config.office_id}) : {e}")
+            return None
+
+    def _fetch(self, config: SpordleConfig, test_date: datetime) -> Optional[List[Match]]:
+        matches = None
+        if self.api_client:
+            matches = self._fetch_api(config, test_date)
+        if matches is None and config.fetch_mode != 'api':
+            if run_deadline.allows(config.browser_min_seconds):
+                matches = self._fetch_browser(config, test_date)
+            else:
+                logger.warning(f"⏳ Temps insuffisant pour Chrome (bureau {config.office_id}) - repli sur le cache")
+        return reconcile_with_cache(config, test_date, matches)
+
+    def _run_club(self, club: ClubConfig, test_date: datetime) -> ClubResult:
+        """Traite un club ; une erreur n'interrompt jamais les autres clubs"""
+        with report.span('club', club=club.name) as attrs:
+            result = self._process_club(club, test_date)
+            attrs.update(matches=result.matches, published=result.published, error=result.error, skipped=result.skipped)
+            if not result.ok:
+                attrs['failed'] = True
+        return result
+
+    def _process_club(self, club: ClubConfig, test_date: datetime) -> ClubResult:
+        result = ClubResult(club.name)
+        start = time.perf_counter()
+        media = None
+        try:
+            spordle_config = self._club_config(club)
+            facebook_config = FacebookConfig(
+                page_id=club.page_id,
+                access_token=club.access_token,
+                sponsor_folder=club.sponsor_folder,
+                intro_message=club.intro_message
+            )
+            # Hors saison ou journée vide au cache : ni extraction ni images (un horaire déjà publié
+            # n'est écarté qu'après l'extraction, par le registre de publish_matches)
+            reason = nothing_to_do(spordle_config, test_date)
+            if reason:
+                logger.info(f"[{club.name}] Aucune publication nécessaire : {reason}")
+                result.skipped = reason
+                return result
+
+            publisher = FacebookPublisher(facebook_config)
+            if facebook_config.media_pipeline:
+                # Images du club préparées pendant son extraction
+                media = SponsorMediaPipeline(publisher).start()
+
+            with run_deadline.stage('extract'):
+                matches = self._fetch(spordle_config, test_date)
+            if matches is None:
+                result.error = "extraction échouée"
+                return result
+            result.matches = len(matches)
+            if not matches:
+                logger.info(f"[{club.name}] Aucun match le {test_date.strftime('%Y-%m-%d')} - aucune publication")
+                return result
+
+            result.published = publisher.publish_matches(matches, test_date, media)
+            if not result.published:
+                result.error = "publication échouée"
+        except Exception as e:
+            result.error = str(e)
+        finally:
+            if media:
+                media.close()
+            result.elapsed = time.perf_counter() - start
+        return result
+
+    def run(self, test_date: datetime) -> List[ClubResult]:
+        logger.info(f"=== MODE MULTI-CLUBS : {len(self.clubs)} club(s), {self.workers} en parallèle ===")
+        start = time.perf_counter()
+        try:
+            if self._login_api():
+                logger.info("Jeton API Spordle partagé par tous les clubs")
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                results = list(pool.map(lambda club: self._run_club(club, test_date), self.clubs))
+        finally:
+            self.close()
+
+        for result in results:
+            status = "✅" if result.ok else "❌"
+            detail = result.error or result.skipped or (f"{result.matches} match(s)" + (", publié" if result.published else ""))
+            logger.info(f"{status} {result.name} : {detail} ({result.elapsed:.1f}s)")
+        logger.info(f"⏱️ {len(results)} club(s) traité(s) en {time.perf_counter() - start:.1f}s")
+        return results
+
+    def close(self):
+        if self.api_client:
+            self.api_client.close()
+        if self.driver_pool:
+            self.driver_pool.close()
+
+def run_clubs(clubs_file: str, test_date: datetime) -> bool:
+    """Publie l'horaire de chaque club du fichier ; échoue si au moins un club a échoué"""
+    runner = MultiClubRunner(
+        load_clubs(clubs_file),
+        workers=int(os.getenv('CLUBS_WORKERS', '4')),
+        browser_workers=int(os.getenv('DRIVER_POOL_SIZE', '2'))
+    )
+    results = runner.run(test_date)
+    report.set('clubs', {
+        result.name: {'matches': result.matches, 'published': result.published, 'error': result.error, 'skipped': result.skipped}
+        for result in results
+    })
+    return all(result.ok for result in results)
+
+if __name__ == "__main__":
+    deadline_minutes = float(os.getenv('RUN_DEADLINE_MINUTES', '25'))
+    run_deadline.reset(deadline_minutes * 60 if deadline_minutes > 0 else None)
+    date_offset = int(os.getenv('DATE_OFFSET', '0'))
+    success = run_clubs(
+        sys.argv[1] if len(sys.argv) > 1 else os.getenv('SPORDLE_CLUBS_FILE', 'clubs.json'),
+        datetime.now() + timedelta(days=date_offset)
+    )
+    report.set('success', success)
+    report.write(os.getenv('RUN_REPORT_FILE', 'temp/run_report.json'))
+    sys.exit(0 if success else 1)
@@ -0,0 +1,79 @@
+"""
+Normalisation des noms d'équipes, des terrains et des heures (horaire Spordle et horaire Excel)
+
+Utilisable en ligne de commande par horraire.ps1 : une valeur par ligne sur l'entrée standard,
+la valeur normalisée sur la sortie standard, dans le même ordre.
+
+    python normalize.py team < equipes.txt
+    python normalize.py venue < terrains.txt
+"""
+
+import re
+import sys
+from functools import lru_cache
+from typing import Iterable, List
+
+# Texte d'une cellule d'équipe ("TITANS", "TOROS 3 - 9U - B ...") plutôt qu'un numéro de match ou un terrain
+TEAM_CANDIDATE = re.compile(r'TITANS|[A-Z]+.*\d+.*[A-Z]')
+NON_TEAM = re.compile(r'^Game|^Parc|^Terrain')
+
+# "TOROS 3 - 9U - B - Masculin - LOTBINIÈRE" -> nom, catégorie d'âge, division (AA, A ou B, mot entier)
+TEAM_PARTS = re.compile(r'^([A-Z]+(?:\s+\d+)?).*?(\d+U).*?\b(AA|A|B)\b')
+TEAM_DELIMITER = re.compile(r'\s*-\s*')
+AGE_GROUP = re.compile(r'^\d+U$')
+
+VENUE_SUFFIX = re.compile(r' - Baseball.*$')
+START_TIME = re.compile(r'^(\d{1,2}:\d{2})')
+
+def is_team_name(text: str) -> bool:
+    return bool(TEAM_CANDIDATE.match(text)) and not NON_TEAM.match(text)
+
+def team_names(texts: Iterable[str]) -> List[str]:
+    """Garde les textes d'une cellule qui sont des noms d'équipes"""
+    return [text for text in texts if is_team_name(text)]
+
+@lru_cache(maxsize=1024)
+def canonical_team(name: str) -> str:
+    """Nom court d'une équipe : "TOROS 3 - 9U - B - Masculin - LOTBINIÈRE" -> "TOROS 3 9UB" """
+    if not name:
+        return name
+
+    match = TEAM_PARTS.match(name)
+    if match:
+        return f"{match.group(1).strip()} {match.group(2)}{match.group(3)}"
+
+    # Noms accentués ("ÉCLAIRS 2 - 9U - A - ...") : les trois premières parties séparées par des tirets
+    parts = TEAM_DELIMITER.sub('-', name).split('-')
+    if len(parts) >= 3 and AGE_GROUP.match(parts[1]):
+        return f"{parts[0]} {parts[1]}{parts[2]}"
+    return name
+
+@lru_cache(maxsize=256)
+def canonical_venue(venue: str) -> str:
+    """Nom du terrain sans le suffixe " - Baseball ..." """
+    return VENUE_SUFFIX.sub("", venue)
+
+def canonical_time(text: str) -> str:
+    """Heure HH:MM au début du texte de la cellule (texte inchangé sinon)"""
+    match = START_TIME.match(text)
+    return match.group(1) if match else text
+
+def canonical_teams(names: Iterable[str]) -> List[str]:
+    """Normalise une colonne entière de noms (chaque nom distinct n'est traité qu'une fois)"""
+    names = list(names)
+    mapping = {name: canonical_team(name) for name in dict.fromkeys(names)}
+    return [mapping[name] for name in names]
+
+def canonical_venues(venues: Iterable[str]) -> List[str]:
+    venues = list(venues)
+    mapping = {venue: canonical_venue(venue) for venue in dict.fromkeys(venues)}
+    return [mapping[venue] for venue in venues]
+
+if __name__ == "__main__":
+    kinds = {'team': canonical_teams, 'venue': canonical_venues}
+    if len(sys.argv) != 2 or sys.argv[1] not in kinds:
+        sys.exit("Usage : python normalize.py team|venue < valeurs.txt")
+    sys.stdin.reconfigure(encoding='utf-8-sig')
+    sys.stdout.reconfigure(encoding='utf-8')
+    values = [line.rstrip('\r\n') for line in sys.stdin]
+    sys.stdout.write(''.join(f"{value}\n" for value in kinds[sys.argv[1]](values)))
@@ -0,0 +1,114 @@
+"""
+Registre persistant (SQLite) des publications Facebook : une relance reprend à la première étape
+incomplète et ne republie jamais un horaire identique pour la même page et la même date
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS publications (
+    page_id TEXT NOT NULL,
+    game_date TEXT NOT NULL,
+    schedule_hash TEXT NOT NULL,
+    media_fbids TEXT,
+    post_id TEXT,
+    images_attached INTEGER,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (page_id, game_date, schedule_hash)
+);
+"""
+
+def schedule_hash(matches) -> str:
+    """Empreinte de l'horaire d'une journée, indépendante de l'ordre des matchs"""
+    games = sorted((m.time, m.home_team, m.away_team, m.venue) for m in matches)
+    return hashlib.sha256(json.dumps(games, ensure_ascii=False).encode('utf-8')).hexdigest()[:16]
+
+@dataclass
+class LedgerEntry:
+    """Étapes terminées d'une publication : images envoyées (media_fbid), puis post créé"""
+    page_id: str
+    day: date
+    schedule_hash: str
+    media_fbids: Optional[List[str]] = None
+    post_id: Optional[str] = None
+    images_attached: int = 0
+    updated_at: float = field(default_factory=time.time)
+
+    @property
+    def published(self) -> bool:
+        return self.post_id is not None
+
+    @property
+    def attached_media(self) -> List[Dict]:
+        return [{'media_fbid': fbid} for fbid in self.media_fbids or []]
+
+class PublishLedger:
+    """Publications par (page, date, empreinte de l'horaire)"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path), timeout=30)
+        self.conn.executescript(SCHEMA)
+
+    def get(self, page_id: str, day: date, digest: str) -> LedgerEntry:
+        """Étapes déjà terminées pour cet horaire (entrée vide si rien n'a été fait)"""
+        row = self.conn.execute(
+            "SELECT media_fbids, post_id, images_attached, updated_at FROM publications "
+            "WHERE page_id = ? AND game_date = ? AND schedule_hash = ?",
+            (page_id, day.isoformat(), digest)
+        ).fetchone()
+        if row is None:
+            return LedgerEntry(page_id, day, digest)
+        return LedgerEntry(
+            page_id, day, digest,
+            media_fbids=json.loads(row[0]) if row[0] is not None else None,
+            post_id=row[1],
+            images_attached=row[2] or 0,
+            updated_at=row[3]
+        )
+
+    def latest_post(self, page_id: str, day: date) -> Optional[LedgerEntry]:
+        """Dernière publication de la journée sur la page, quel que soit l'horaire"""
+        row = self.conn.execute(
+            "SELECT schedule_hash FROM publications WHERE page_id = ? AND game_date = ? AND post_id IS NOT NULL "
+            "ORDER BY updated_at DESC LIMIT 1",
+            (page_id, day.isoformat())
+        ).fetchone()
+        return self.get(page_id, day, row[0]) if row else None
+
+    def _save(self, entry: LedgerEntry):
+        entry.updated_at = time.time()
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO publications VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (entry.page_id, entry.day.isoformat(), entry.schedule_hash,
+                 json.dumps(entry.media_fbids) if entry.media_fbids is not None else None,
+                 entry.post_id, entry.images_attached, entry.updated_at)
+            )
+
+    def record_media(self, entry: LedgerEntry, attached_media: List[Dict]):
+        """Étape 1 : images non publiées envoyées"""
+        entry.media_fbids = [media['media_fbid'] for media in attached_media]
+        self._save(entry)
+        logger.info(f"📒 Registre : {len(entry.media_fbids)} image(s) envoyée(s)")
+
+    def record_post(self, entry: LedgerEntry, post_id: str, images_attached: int):
+        """Étape 2 : post créé avec ses images (publication terminée)"""
+        entry.post_id = post_id
+        entry.images_attached = images_attached
+        self._save(entry)
+        logger.info(f"📒 Registre : post {post_id} enregistré")
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,144 @@
+"""
+Politique de nouvelles tentatives (délai exponentiel avec gigue) et échéance globale de l'exécution,
+répartie entre les étapes (extraction, images, publication)
+"""
+
+import logging
+import math
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from run_report import report
+
+logger = logging.getLogger(__name__)
+
+# Part du temps total réservée à chaque étape, dans l'ordre d'exécution
+STAGE_SHARES = {'extract': 0.6, 'images': 0.2, 'publish': 0.2}
+
+# Exceptions temporaires reconnues par leur nom (sans importer selenium ni requests)
+RETRYABLE_EXCEPTIONS = {'TimeoutException', 'ConnectionError', 'ConnectTimeout', 'ChunkedEncodingError'}
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# Échecs survenus avant l'envoi de la requête (connexion jamais établie) : sans risque de doublon
+PRE_SEND_EXCEPTIONS = {'ConnectTimeout', 'ConnectTimeoutError', 'NewConnectionError'}
+
+def status_code_of(error: Exception) -> Optional[int]:
+    """Code HTTP porté par l'exception (requests.HTTPError ou SpordleApiError)"""
+    status = getattr(error, 'status_code', None)
+    if status is None and getattr(error, 'response', None) is not None:
+        status = error.response.status_code
+    return status
+
+def _exception_names(error: Exception) -> set:
+    """Noms des classes de l'exception et de sa cause urllib3 (requests.ConnectionError l'enveloppe)"""
+    names = {cls.__name__ for cls in type(error).__mro__}
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    if isinstance(reason, Exception):
+        names |= {cls.__name__ for cls in type(reason).__mro__}
+    return names
+
+def failed_before_send(error: Exception) -> bool:
+    """Vrai si le serveur n'a pas pu recevoir la requête (connexion impossible ou refusée avec 429)"""
+    return bool(_exception_names(error) & PRE_SEND_EXCEPTIONS) or status_code_of(error) == 429
+
+def is_retryable(error: Exception, idempotent: bool = True) -> bool:
+    """Délais Selenium, erreurs réseau et réponses HTTP 5xx/429 ; une requête non idempotente seulement si elle n'a pas été reçue"""
+    if not idempotent:
+        # 5xx, délai de lecture ou connexion coupée : la requête a peut-être été traitée
+        return failed_before_send(error)
+    names = _exception_names(error)
+    if names & RETRYABLE_EXCEPTIONS or 'ReadTimeout' in names:
+        return True
+    return status_code_of(error) in RETRYABLE_STATUS
+
+class Deadline:
+    """Échéance globale ; chaque étape dispose du temps restant moins la part réservée aux étapes suivantes"""
+
+    def __init__(self, total_seconds: Optional[float] = None, shares: Optional[Dict[str, float]] = None):
+        self.local = threading.local()
+        self.reset(total_seconds, shares)
+
+    def reset(self, total_seconds: Optional[float], shares: Optional[Dict[str, float]] = None):
+        self.total = total_seconds
+        self.shares = shares or STAGE_SHARES
+        self.start = time.monotonic()
+
+    def remaining(self) -> float:
+        if self.total is None:
+            return math.inf
+        return max(0.0, self.total - (time.monotonic() - self.start))
+
+    def budget(self, stage: str) -> float:
+        """Temps disponible pour l'étape sans empiéter sur la part des étapes suivantes"""
+        if self.total is None:
+            return math.inf
+        names = list(self.shares)
+        later = names[names.index(stage) + 1:] if stage in names else []
+        reserved = sum(self.shares[name] for name in later) * self.total
+        return max(0.0, self.remaining() - reserved)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Borne les attentes et les nouvelles tentatives du bloc au budget de l'étape"""
+        previous = getattr(self.local, 'stage_end', None)
+        budget = self.budget(name)
+        self.local.stage_end = time.monotonic() + budget
+        logger.info(f"⏳ Étape {name} : {budget:.0f}s disponibles" if budget != math.inf else f"⏳ Étape {name}")
+        try:
+            yield budget
+        finally:
+            self.local.stage_end = previous
+
+    def stage_remaining(self) -> float:
+        """Temps restant pour l'étape en cours (ou pour l'exécution hors étape)"""
+        stage_end = getattr(self.local, 'stage_end', None)
+        if stage_end is None:
+            return self.remaining()
+        return max(0.0, min(self.remaining(), stage_end - time.monotonic()))
+
+    def allows(self, seconds: float) -> bool:
+        return self.stage_remaining() >= seconds
+
+    def cap(self, timeout: float) -> float:
+        """Plafonne une attente au temps restant de l'étape"""
+        return min(timeout, self.stage_remaining())
+
+# Échéance de l'exécution courante (illimitée tant que reset() n'est pas appelé)
+run_deadline = Deadline()
+
+@dataclass
+class RetryPolicy:
+    """Nouvelles tentatives avec délai exponentiel et gigue complète, bornées par l'échéance"""
+    attempts: int = 3
+    base_delay: float = 1.0
+    max_delay: float = 20.0
+    idempotent: bool = True
+
+    def delay(self, attempt: int, error: Exception) -> float:
+        # Retry-After (429/503) respecté s'il est fourni
+        response = getattr(error, 'response', None)
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def call(self, func, *args, description: str = 'appel', **kwargs):
+        """Appelle func et la relance sur erreur temporaire tant que le budget de l'étape le permet"""
+        for attempt in range(1, self.attempts + 1):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                if attempt >= self.attempts or not is_retryable(e, self.idempotent):
+                    raise
+                delay = self.delay(attempt, e)
+                if not run_deadline.allows(delay):
+                    logger.warning(f"{description} : échec ({e}) - plus assez de temps pour une nouvelle tentative")
+                    raise
+                logger.warning(f"{description} : tentative {attempt}/{self.attempts} échouée ({e}) - nouvel essai dans {delay:.1f}s")
+                report.count('retries')
+                report.count(f'retries.{description}')
+                time.sleep(delay)
@@ -0,0 +1,131 @@
+"""
+Rapport d'exécution (JSON) : durée de chaque étape, tentatives, octets envoyés et nombre de matchs
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class RunReport:
+    """Collecte les étapes chronométrées (spans) et les compteurs d'une exécution"""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.spans = []
+        self.counters: Dict[str, float] = defaultdict(int)
+        self.values: Dict[str, object] = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def _parents(self) -> list:
+        if not hasattr(self.local, 'stack'):
+            self.local.stack = []
+        return self.local.stack
+
+    def record(self, name: str, duration: float, status: str = 'ok', parent: Optional[str] = None, **attrs):
+        """Ajoute une étape déjà chronométrée (ex. dans un processus de rendu)"""
+        span = {
+            'name': name,
+            'offset': round(time.perf_counter() - self.start - duration, 4),
+            'duration': round(duration, 4),
+            'status': status,
+            'parent': parent,
+            'thread': threading.current_thread().name,
+        }
+        if attrs:
+            span['attrs'] = attrs
+        with self.lock:
+            self.spans.append(span)
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        """Chronomètre le bloc ; le dictionnaire retourné peut être complété par le bloc"""
+        parents = self._parents()
+        parent = parents[-1] if parents else None
+        parents.append(name)
+        status = 'ok'
+        start = time.perf_counter()
+        try:
+            yield attrs
+        except BaseException:
+            status = 'error'
+            raise
+        finally:
+            parents.pop()
+            if attrs.pop('failed', False):
+                status = 'failed'
+            self.record(name, time.perf_counter() - start, status, parent, **attrs)
+
+    def timed(self, name: Optional[str] = None):
+        """Décorateur : chronomètre la fonction (un retour False marque l'étape comme échouée)"""
+        def decorator(func):
+            span_name = name or func.__name__
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name) as attrs:
+                    result = func(*args, **kwargs)
+                    if result is False:
+                        attrs['failed'] = True
+                    return result
+            return wrapper
+        return decorator
+
+    def count(self, name: str, amount: float = 1):
+        with self.lock:
+            self.counters[name] += amount
+
+    def set(self, name: str, value):
+        with self.lock:
+            self.values[name] = value
+
+    def stages(self) -> Dict[str, Dict]:
+        """Totaux par étape : nombre d'appels, durée totale et maximale"""
+        stages = {}
+        for span in self.spans:
+            stage = stages.setdefault(span['name'], {'count': 0, 'total': 0.0, 'max': 0.0, 'errors': 0})
+            stage['count'] += 1
+            stage['total'] = round(stage['total'] + span['duration'], 4)
+            stage['max'] = max(stage['max'], span['duration'])
+            if span['status'] != 'ok':
+                stage['errors'] += 1
+        return stages
+
+    def to_dict(self) -> Dict:
+        with self.lock:
+            return {
+                'started_at': datetime.fromtimestamp(self.started_at).isoformat(timespec='seconds'),
+                'duration': round(time.perf_counter() - self.start, 4),
+                'values': dict(self.values),
+                'counters': dict(self.counters),
+                'stages': self.stages(),
+                'spans': list(self.spans),
+            }
+
+    def write(self, path: str):
+        """Écrit le rapport JSON et affiche la durée de chaque étape"""
+        data = self.to_dict()
+        report_path = Path(path)
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        report_path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding='utf-8')
+
+        logger.info(f"=== RAPPORT D'EXÉCUTION ({data['duration']:.1f}s) ===")
+        for name, stage in sorted(data['stages'].items(), key=lambda item: -item[1]['total']):
+            errors = f", {stage['errors']} échec(s)" if stage['errors'] else ""
+            logger.info(f"   {name} : {stage['total']:.2f}s ({stage['count']} appel(s){errors})")
+        for name, value in sorted(data['counters'].items()):
+            logger.info(f"   {name} = {value}")
+        logger.info(f"Rapport écrit : {report_path}")
+
+# Rapport de l'exécution courante, partagé par tous les modules
+report = RunReport()
@@ -0,0 +1,149 @@
+"""
+Cache local (SQLite) de l'horaire Spordle avec rafraîchissement incrémental et détection des changements
+"""
+
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from models import Match
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    game_date TEXT NOT NULL,
+    time TEXT NOT NULL,
+    home_team TEXT NOT NULL,
+    away_team TEXT NOT NULL,
+    venue TEXT NOT NULL,
+    date_text TEXT NOT NULL,
+    full_text TEXT NOT NULL,
+    PRIMARY KEY (game_date, time, home_team, away_team, venue)
+);
+CREATE TABLE IF NOT EXISTS refreshes (
+    game_date TEXT PRIMARY KEY,
+    refreshed_at REAL NOT NULL
+);
+"""
+
+def _game_key(match: Match) -> Tuple[str, str, str, str]:
+    return (match.time, match.home_team, match.away_team, match.venue)
+
+@dataclass
+class ScheduleDiff:
+    """Différences entre l'horaire en cache et l'horaire récupéré"""
+    added: List[Match] = field(default_factory=list)
+    moved: List[Tuple[Match, Match]] = field(default_factory=list)
+    cancelled: List[Match] = field(default_factory=list)
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.moved or self.cancelled)
+
+    def extend(self, other: 'ScheduleDiff'):
+        self.added.extend(other.added)
+        self.moved.extend(other.moved)
+        self.cancelled.extend(other.cancelled)
+
+    def log(self):
+        """Affiche le résumé des changements"""
+        if not self.has_changes:
+            logger.info("Horaire inchangé depuis le dernier rafraîchissement")
+            return
+        logger.info(f"🔄 Horaire modifié : {len(self.added)} ajout(s), {len(self.moved)} déplacement(s), {len(self.cancelled)} annulation(s)")
+        for match in self.added:
+            logger.info(f"   ➕ {match.date} {match.time} {match.home_team} vs {match.away_team} ({match.venue})")
+        for old, new in self.moved:
+            logger.info(f"   🔀 {old.home_team} vs {old.away_team} : {old.date} {old.time} {old.venue} → {new.date} {new.time} {new.venue}")
+        for match in self.cancelled:
+            logger.info(f"   ❌ {match.date} {match.time} {match.home_team} vs {match.away_team} ({match.venue})")
+
+class ScheduleCache:
+    """Horaire persistant, indexé par date/heure/équipes/terrain"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.executescript(SCHEMA)
+
+    def get_matches(self, day: date) -> Optional[List[Match]]:
+        """Matchs en cache pour une date (None si la date n'a jamais été rafraîchie)"""
+        if self.refreshed_at(day) is None:
+            return None
+        rows = self.conn.execute(
+            "SELECT date_text, time, home_team, away_team, venue, full_text FROM games WHERE game_date = ? ORDER BY time",
+            (day.isoformat(),)
+        ).fetchall()
+        return [Match(date=r[0], time=r[1], home_team=r[2], away_team=r[3], venue=r[4], full_text=r[5]) for r in rows]
+
+    def refreshed_at(self, day: date) -> Optional[float]:
+        row = self.conn.execute("SELECT refreshed_at FROM refreshes WHERE game_date = ?", (day.isoformat(),)).fetchone()
+        return row[0] if row else None
+
+    def stale_days(self, start: date, end: date, max_age_hours: float) -> List[date]:
+        """Dates de la fenêtre jamais rafraîchies ou plus vieilles que max_age_hours"""
+        limit = time.time() - max_age_hours * 3600
+        stale = []
+        day = start
+        while day <= end:
+            refreshed = self.refreshed_at(day)
+            if refreshed is None or refreshed < limit:
+                stale.append(day)
+            day += timedelta(days=1)
+        return stale
+
+    def update_day(self, day: date, matches: List[Match]) -> ScheduleDiff:
+        """Remplace les matchs d'une date et retourne les différences avec le cache"""
+        previous = self.get_matches(day) or []
+        diff = ScheduleDiff()
+        old_by_key = {_game_key(m): m for m in previous}
+        new_by_key = {_game_key(m): m for m in matches}
+        added = [m for k, m in new_by_key.items() if k not in old_by_key]
+        removed = [m for k, m in old_by_key.items() if k not in new_by_key]
+
+        # Même affiche à une autre heure ou sur un autre terrain = déplacement
+        for old in removed:
+            moved_to = next((m for m in added if (m.home_team, m.away_team) == (old.home_team, old.away_team)), None)
+            if moved_to:
+                added.remove(moved_to)
+                diff.moved.append((old, moved_to))
+            else:
+                diff.cancelled.append(old)
+        diff.added = added
+
+        with self.conn:
+            self.conn.execute("DELETE FROM games WHERE game_date = ?", (day.isoformat(),))
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO games VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(day.isoformat(), m.time, m.home_team, m.away_team, m.venue, m.date, m.full_text) for m in matches]
+            )
+            self.conn.execute("INSERT OR REPLACE INTO refreshes VALUES (?, ?)", (day.isoformat(), time.time()))
+        return diff
+
+    def update_window(self, matches_by_date: Dict[date, List[Match]]) -> ScheduleDiff:
+        """Met à jour chaque date de la fenêtre récupérée"""
+        diff = ScheduleDiff()
+        for day, matches in sorted(matches_by_date.items()):
+            diff.extend(self.update_day(day, matches))
+        return diff
+
+    def refresh(self, extractor, today: date, days_ahead: int = 7, max_age_hours: float = 12) -> ScheduleDiff:
+        """Rafraîchit seulement les dates périmées autour d'aujourd'hui"""
+        stale = self.stale_days(today, today + timedelta(days=days_ahead), max_age_hours)
+        if not stale:
+            logger.info("Cache de l'horaire à jour - aucun rafraîchissement requis")
+            return ScheduleDiff()
+
+        logger.info(f"Rafraîchissement du cache : {stale[0]} → {stale[-1]}")
+        diff = self.update_window(extractor.get_matches_range(stale[0], stale[-1]))
+        diff.log()
+        return diff
+
+    def close(self):
+        self.conn.close()
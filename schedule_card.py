@@ -0,0 +1,253 @@
+"""
+Carte image de l'horaire de la journée (couleurs du club, bandeau des commanditaires)
+
+Le fond, les polices et le bandeau des commanditaires sont rendus une seule fois (et gardés sur disque) ;
+chaque carte ne dessine que la date et les lignes de matchs sur une copie du gabarit.
+"""
+
+import hashlib
+import io
+import logging
+import time
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+from models import Match, SponsorImage
+
+logger = logging.getLogger(__name__)
+
+# À incrémenter si le dessin du gabarit change (invalide le cache disque)
+TEMPLATE_VERSION = 1
+
+# Polices essayées dans l'ordre si aucune n'est configurée (Linux, Windows)
+FONT_CANDIDATES = {
+    False: ("DejaVuSans.ttf", "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", "arial.ttf"),
+    True: ("DejaVuSans-Bold.ttf", "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", "arialbd.ttf"),
+}
+
+JOURS = ("lundi", "mardi", "mercredi", "jeudi", "vendredi", "samedi", "dimanche")
+MOIS = ("janvier", "février", "mars", "avril", "mai", "juin", "juillet", "août",
+        "septembre", "octobre", "novembre", "décembre")
+
+Color = Tuple[int, int, int]
+
+def hex_color(value: str) -> Color:
+    """"#0b1f3a" -> (11, 31, 58)"""
+    value = value.strip().lstrip('#')
+    return tuple(int(value[i:i + 2], 16) for i in (0, 2, 4))
+
+def french_date(day: date) -> str:
+    return f"{JOURS[day.weekday()].capitalize()} {day.day} {MOIS[day.month - 1]} {day.year}"
+
+@lru_cache(maxsize=32)
+def load_font(size: int, bold: bool = False, path: Optional[str] = None) -> ImageFont.FreeTypeFont:
+    """Police TrueType chargée une seule fois par (taille, graisse, fichier)"""
+    for candidate in ((path,) if path else ()) + FONT_CANDIDATES[bold]:
+        try:
+            return ImageFont.truetype(candidate, size)
+        except OSError:
+            continue
+    logger.warning("Aucune police TrueType trouvée - police par défaut de Pillow")
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:
+        return ImageFont.load_default()
+
+@lru_cache(maxsize=2048)
+def fit_text(text: str, font: ImageFont.FreeTypeFont, width: int) -> str:
+    """Tronque le texte (avec …) pour qu'il tienne dans la largeur donnée"""
+    if font.getlength(text) <= width:
+        return text
+    while text and font.getlength(text + "…") > width:
+        text = text[:-1]
+    return text.rstrip() + "…"
+
+@dataclass(frozen=True)
+class CardStyle:
+    """Dimensions et couleurs de la carte (portrait 4:5, format conseillé pour le fil Facebook)"""
+    title: str = "TITANS"
+    width: int = 1080
+    height: int = 1350
+    background: Color = (11, 31, 58)
+    background_end: Color = (3, 10, 22)
+    accent: Color = (242, 183, 5)
+    text: Color = (255, 255, 255)
+    muted: Color = (168, 184, 206)
+    font_path: Optional[str] = None
+    bold_font_path: Optional[str] = None
+    rows: int = 8
+
+    # Zones verticales (pixels)
+    header_height: int = 250
+    rows_top: int = 320
+    row_height: int = 100
+    strip_height: int = 200
+
+@dataclass(frozen=True)
+class _Fonts:
+    title: ImageFont.FreeTypeFont
+    subtitle: ImageFont.FreeTypeFont
+    day: ImageFont.FreeTypeFont
+    time: ImageFont.FreeTypeFont
+    teams: ImageFont.FreeTypeFont
+    venue: ImageFont.FreeTypeFont
+    small: ImageFont.FreeTypeFont
+
+class ScheduleCardRenderer:
+    """Rend les cartes de l'horaire sur un gabarit pré-rendu (fond, en-tête, bandes des lignes, commanditaires)"""
+
+    def __init__(self, style: CardStyle = CardStyle(), sponsor_folder: Optional[str] = None,
+                 cache_dir: Optional[str] = None, quality: int = 88):
+        self.style = style
+        self.sponsor_folder = Path(sponsor_folder) if sponsor_folder else None
+        # Dossier vide : gabarit gardé en mémoire seulement
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.quality = quality
+        self.fonts = _Fonts(
+            title=load_font(96, True, style.bold_font_path),
+            subtitle=load_font(40, False, style.font_path),
+            day=load_font(46, True, style.bold_font_path),
+            time=load_font(40, True, style.bold_font_path),
+            teams=load_font(34, True, style.bold_font_path),
+            venue=load_font(26, False, style.font_path),
+            small=load_font(26, False, style.font_path),
+        )
+        self._template: Optional[Image.Image] = None
+
+    def _sponsor_files(self) -> List[Path]:
+        if not self.sponsor_folder or not self.sponsor_folder.exists():
+            return []
+        return sorted(f for f in self.sponsor_folder.iterdir()
+                      if f.is_file() and f.suffix.lower() in ('.jpg', '.jpeg', '.png'))
+
+    def _template_key(self, sponsors: List[Path]) -> str:
+        digest = hashlib.sha256(f"{self.style}|v{TEMPLATE_VERSION}".encode())
+        for sponsor in sponsors:
+            stat = sponsor.stat()
+            digest.update(f"|{sponsor.name}|{stat.st_size}|{stat.st_mtime_ns}".encode())
+        return digest.hexdigest()[:24]
+
+    @property
+    def template(self) -> Image.Image:
+        """Gabarit rendu une seule fois : mémoire, puis cache disque (invalidé si le style ou les commanditaires changent)"""
+        if self._template is None:
+            sponsors = self._sponsor_files()
+            cached = self.cache_dir / f"card_template_{self._template_key(sponsors)}.png" if self.cache_dir else None
+            if cached and cached.exists():
+                with Image.open(cached) as img:
+                    self._template = img.convert('RGB')
+            else:
+                start = time.perf_counter()
+                self._template = self._render_template(sponsors)
+                logger.info(f"⏱️ Gabarit de la carte rendu : {time.perf_counter() - start:.2f}s")
+                if cached:
+                    cached.parent.mkdir(parents=True, exist_ok=True)
+                    self._template.save(cached, format='PNG')
+        return self._template
+
+    def _render_template(self, sponsors: List[Path]) -> Image.Image:
+        style = self.style
+        # Dégradé vertical du fond
+        mask = Image.linear_gradient('L').resize((style.width, style.height))
+        card = Image.composite(Image.new('RGB', (style.width, style.height), style.background_end),
+                               Image.new('RGB', (style.width, style.height), style.background), mask)
+        draw = ImageDraw.Draw(card)
+
+        # En-tête : nom du club et sous-titre
+        draw.rectangle((0, style.header_height - 8, style.width, style.header_height), fill=style.accent)
+        draw.text((style.width // 2, 105), style.title, font=self.fonts.title, fill=style.accent, anchor='mm')
+        draw.text((style.width // 2, 190), "Matchs de la journée", font=self.fonts.subtitle, fill=style.text, anchor='mm')
+
+        # Bandes alternées des lignes de matchs
+        for index in range(style.rows):
+            top = style.rows_top + index * style.row_height
+            if index % 2 == 0:
+                draw.rectangle((40, top, style.width - 40, top + style.row_height - 6), fill=self._shade(style.background, 18))
+
+        # Bandeau des commanditaires
+        strip_top = style.height - style.strip_height
+        draw.rectangle((0, strip_top, style.width, style.height), fill=(255, 255, 255))
+        draw.text((style.width // 2, strip_top + 26), "Merci à nos commanditaires !", font=self.fonts.small,
+                  fill=style.background, anchor='mm')
+        self._paste_sponsors(card, sponsors, (30, strip_top + 50, style.width - 30, style.height - 14))
+        return card
+
+    @staticmethod
+    def _shade(color: Color, amount: int) -> Color:
+        return tuple(min(255, channel + amount) for channel in color)
+
+    @staticmethod
+    def _paste_sponsors(card: Image.Image, sponsors: List[Path], box: Tuple[int, int, int, int]):
+        """Logos réduits à la hauteur du bandeau et centrés côte à côte"""
+        left, top, right, bottom = box
+        height = bottom - top
+        logos = []
+        for sponsor in sponsors:
+            try:
+                with Image.open(sponsor) as img:
+                    img.draft('RGB', (img.width * height // img.height, height))  # décodage JPEG réduit
+                    logo = img.convert('RGB')
+                    logo.thumbnail((right - left, height), Image.Resampling.LANCZOS)
+                    logos.append(logo)
+            except Exception as e:
+                logger.warning(f"Commanditaire ignoré dans la carte ({sponsor.name}) : {e}")
+        if not logos:
+            return
+        # Réduire l'ensemble si les logos dépassent la largeur du bandeau
+        gap = 20
+        total = sum(logo.width for logo in logos) + gap * (len(logos) - 1)
+        scale = min(1.0, (right - left) / total)
+        if scale < 1.0:
+            logos = [logo.resize((max(1, int(logo.width * scale)), max(1, int(logo.height * scale))), Image.Resampling.LANCZOS)
+                     for logo in logos]
+            total = sum(logo.width for logo in logos) + gap * (len(logos) - 1)
+        x = left + (right - left - total) // 2
+        for logo in logos:
+            card.paste(logo, (x, top + (height - logo.height) // 2))
+            x += logo.width + gap
+
+    def render(self, day: date, matches: List[Match]) -> Image.Image:
+        """Carte d'une journée : copie du gabarit + date et lignes de matchs"""
+        style = self.style
+        fonts = self.fonts
+        card = self.template.copy()
+        draw = ImageDraw.Draw(card)
+        draw.text((style.width // 2, style.header_height + 36), french_date(day), font=fonts.day, fill=style.text, anchor='mm')
+
+        # Colonnes : heure | équipes / terrain
+        time_x, teams_x = 70, 230
+        teams_width = style.width - 60 - teams_x
+        shown = matches if len(matches) <= style.rows else matches[:style.rows - 1]
+        for index, match in enumerate(shown):
+            top = style.rows_top + index * style.row_height
+            draw.rectangle((40, top, 48, top + style.row_height - 6), fill=style.accent)
+            draw.text((time_x, top + 47), match.time, font=fonts.time, fill=style.accent, anchor='lm')
+            teams = fit_text(f"{match.home_team}  vs  {match.away_team}", fonts.teams, teams_width)
+            draw.text((teams_x, top + 30), teams, font=fonts.teams, fill=style.text, anchor='lm')
+            venue = fit_text(match.venue, fonts.venue, teams_width)
+            draw.text((teams_x, top + 70), venue, font=fonts.venue, fill=style.muted, anchor='lm')
+        if len(shown) < len(matches):
+            top = style.rows_top + len(shown) * style.row_height
+            others = len(matches) - len(shown)
+            draw.text((style.width // 2, top + 47), f"+ {others} autre{'s' if others > 1 else ''} match{'s' if others > 1 else ''}",
+                      font=fonts.teams, fill=style.muted, anchor='mm')
+        return card
+
+    def render_week(self, matches_by_date: Dict[date, List[Match]], include_empty: bool = False) -> Dict[date, Image.Image]:
+        """Cartes de plusieurs journées en un appel (gabarit et polices partagés)"""
+        return {day: self.render(day, matches) for day, matches in sorted(matches_by_date.items())
+                if matches or include_empty}
+
+    def encode(self, card: Image.Image) -> bytes:
+        buffer = io.BytesIO()
+        card.save(buffer, format='JPEG', quality=self.quality, optimize=True)
+        return buffer.getvalue()
+
+    def sponsor_image(self, day: date, matches: List[Match]) -> SponsorImage:
+        """Carte encodée, prête à l'envoi comme une image de commanditaire"""
+        return SponsorImage(name=f"horaire_{day.isoformat()}", data=self.encode(self.render(day, matches)), format='JPEG')
@@ -0,0 +1,194 @@
+"""
+Analyse locale (en une passe) du HTML de la page des matchs Spordle
+"""
+
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, date
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+
+# Éléments HTML sans balise fermante
+VOID_ELEMENTS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+
+DATE_HEADER_PATTERN = re.compile(r'\w+day,.*\d{4}')
+
+@dataclass
+class GameRow:
+    """Textes d'une ligne du tableau des matchs"""
+    times: List[str] = field(default_factory=list)
+    teams: List[str] = field(default_factory=list)
+    venues: List[str] = field(default_factory=list)
+
+@dataclass
+class DateSection:
+    """En-tête de date et lignes du tableau qui le suit"""
+    date_text: str
+    rows: List[GameRow] = field(default_factory=list)
+    has_table: bool = False
+
+    @property
+    def date(self) -> Optional[date]:
+        """Date de l'en-tête ("Wednesday, July 9, 2025"), None si format inconnu"""
+        try:
+            return datetime.strptime(self.date_text, "%A, %B %d, %Y").date()
+        except ValueError:
+            return None
+
+@dataclass
+class ScheduleSnapshot:
+    """Résultat de l'analyse de la page des matchs, indexé par en-tête de date"""
+    sections: List[DateSection] = field(default_factory=list)
+    by_text: Dict[str, DateSection] = field(default_factory=dict, repr=False)
+    by_date: Dict[date, DateSection] = field(default_factory=dict, repr=False)
+
+    def add(self, section: DateSection):
+        """Ajoute une section et l'indexe par texte et par date (le premier en-tête d'une date l'emporte)"""
+        self.sections.append(section)
+        self.by_text.setdefault(section.date_text, section)
+        section_date = section.date
+        if section_date:
+            self.by_date.setdefault(section_date, section)
+
+    @property
+    def date_texts(self) -> List[str]:
+        return [section.date_text for section in self.sections]
+
+    @property
+    def game_count(self) -> int:
+        """Nombre de lignes de match sur la page, avec ou sans heure (les lignes d'en-tête n'ont aucune cellule de match)"""
+        return sum(1 for section in self.sections for row in section.rows if row.times or row.teams or row.venues)
+
+    @property
+    def has_table(self) -> bool:
+        """Au moins un tableau de matchs rendu (faux pour une page "Loading...")"""
+        return any(section.has_table for section in self.sections)
+
+    @property
+    def last_date(self) -> Optional[date]:
+        return max(self.by_date) if self.by_date else None
+
+    @classmethod
+    def merge(cls, snapshots: List['ScheduleSnapshot']) -> 'ScheduleSnapshot':
+        """Combine plusieurs pages de résultats (une date coupée entre deux pages est regroupée)"""
+        merged = cls()
+        for snapshot in snapshots:
+            for section in snapshot.sections:
+                existing = merged.by_text.get(section.date_text)
+                if existing:
+                    existing.rows.extend(section.rows)
+                    existing.has_table = existing.has_table or section.has_table
+                else:
+                    merged.add(DateSection(section.date_text, list(section.rows), section.has_table))
+        return merged
+
+    def find(self, *date_texts: str) -> Optional[DateSection]:
+        """Retourne la section correspondant à l'un des formats de date donnés (recherche O(1))"""
+        for date_text in date_texts:
+            section = self.by_text.get(date_text)
+            if section:
+                return section
+        return None
+
+    def section_for(self, day: date) -> Optional[DateSection]:
+        """Section d'une date, quel que soit le format de l'en-tête (avec ou sans zéro initial)"""
+        return self.by_date.get(day)
+
+class _ScheduleHTMLParser(HTMLParser):
+    """Parcourt le HTML une seule fois et regroupe les lignes de chaque tableau sous son en-tête de date"""
+
+    # Cellule du tableau -> (classe du texte recherché, attribut de GameRow)
+    CELL_TARGETS = {
+        'column-time': ('span', 'MuiTypography-noWrap', 'times'),
+        'column-homeTeamId': ('p', 'MuiTypography-displayInline', 'teams'),
+        'column-arenaId': ('p', 'MuiTypography-displayInline', 'venues'),
+    }
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.snapshot = ScheduleSnapshot()
+        self.stack: List[str] = []
+        self.pending_section: Optional[DateSection] = None  # en-tête en attente de son tableau
+        self.table_section: Optional[DateSection] = None
+        self.table_depth: Optional[int] = None
+        self.row: Optional[GameRow] = None
+        self.cell: Optional[str] = None
+        self.cell_depth: Optional[int] = None
+        self.capture: Optional[list] = None
+        self.capture_depth: Optional[int] = None
+        self.capture_target: Optional[str] = None
+
+    def handle_starttag(self, tag, attrs):
+        classes = (dict(attrs).get('class') or '').split()
+        if tag not in VOID_ELEMENTS:
+            self.stack.append(tag)
+        depth = len(self.stack)
+
+        if self.capture is not None:
+            return
+
+        if tag == 'h6' and any(c.startswith('MuiTypography') for c in classes):
+            self._start_capture(depth, 'header')
+        elif tag == 'table' and 'MuiTable-root' in classes and self.table_depth is None:
+            self.table_section, self.pending_section = self.pending_section, None
+            self.table_depth = depth
+            if self.table_section:
+                self.table_section.has_table = True
+        elif tag == 'tr' and self.table_section and 'MuiTableRow-root' in classes:
+            self.row = GameRow()
+            self.table_section.rows.append(self.row)
+        elif tag == 'td' and self.row is not None:
+            self.cell = next((c for c in classes if c in self.CELL_TARGETS), None)
+            self.cell_depth = depth
+        elif self.cell and tag == self.CELL_TARGETS[self.cell][0] and self.CELL_TARGETS[self.cell][1] in classes:
+            self._start_capture(depth, self.CELL_TARGETS[self.cell][2])
+
+    def _start_capture(self, depth: int, target: str):
+        self.capture = []
+        self.capture_depth = depth
+        self.capture_target = target
+
+    def handle_data(self, data):
+        if self.capture is not None:
+            self.capture.append(data)
+
+    def handle_endtag(self, tag):
+        if tag in VOID_ELEMENTS or tag not in self.stack:
+            return
+        # Fermer aussi les éléments laissés ouverts (HTML non strict)
+        while self.stack:
+            depth = len(self.stack)
+            closed = self.stack.pop()
+            self._close(depth)
+            if closed == tag:
+                break
+
+    def _close(self, depth: int):
+        if self.capture is not None and depth == self.capture_depth:
+            text = ' '.join(''.join(self.capture).split())
+            self._store(text)
+            self.capture = None
+            self.capture_depth = None
+        if self.cell_depth is not None and depth == self.cell_depth:
+            self.cell = None
+            self.cell_depth = None
+        if self.table_depth is not None and depth == self.table_depth:
+            self.table_section = None
+            self.table_depth = None
+            self.row = None
+
+    def _store(self, text: str):
+        if self.capture_target == 'header':
+            if DATE_HEADER_PATTERN.match(text) and len(text) < 100:
+                section = DateSection(text)
+                self.snapshot.add(section)
+                self.pending_section = section
+        elif self.row is not None:
+            getattr(self.row, self.capture_target).append(text)
+
+def parse_schedule_html(page_source: str) -> ScheduleSnapshot:
+    """Analyse le HTML de la page des matchs (aucun appel au driver)"""
+    parser = _ScheduleHTMLParser()
+    parser.feed(page_source)
+    parser.close()
+    return parser.snapshot
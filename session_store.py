@@ -0,0 +1,116 @@
+"""
+Stockage chiffré de la session Spordle (cookies + localStorage) entre les exécutions
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SALT_SIZE = 16
+KDF_ITERATIONS = 200_000
+
+# Jeton d'accès au format JWT (en-tête.charge.signature), préféré aux autres clés contenant "token"
+JWT_PATTERN = re.compile(r'^[\w-]+\.[\w-]+\.[\w-]+$')
+
+class SessionStore:
+    """Persiste la session authentifiée dans un fichier chiffré (Fernet)"""
+
+    def __init__(self, path: str, secret: str, max_age_hours: float = 24 * 7):
+        self.path = Path(path)
+        self.secret = secret.encode('utf-8')
+        self.max_age = max_age_hours * 3600
+
+    def _fernet(self, salt: bytes):
+        # cryptography n'est chargé qu'au premier accès à la session
+        from cryptography.fernet import Fernet
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+        kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=salt, iterations=KDF_ITERATIONS)
+        return Fernet(base64.urlsafe_b64encode(kdf.derive(self.secret)))
+
+    def save(self, cookies: List[Dict], local_storage: Optional[Dict] = None):
+        """Chiffre et enregistre les cookies et le localStorage"""
+        self._write({
+            'saved_at': time.time(),
+            'cookies': cookies,
+            'local_storage': local_storage or {},
+        })
+        logger.info(f"Session Spordle sauvegardée : {self.path} ({len(cookies)} cookies)")
+
+    def _write(self, data: Dict):
+        payload = json.dumps(data).encode('utf-8')
+        salt = os.urandom(SALT_SIZE)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        tmp_path.write_bytes(salt + self._fernet(salt).encrypt(payload))
+        os.chmod(tmp_path, 0o600)
+        tmp_path.replace(self.path)
+
+    def reject_token(self, token: str):
+        """Écarte un jeton refusé par l'API ; les cookies et le localStorage (session Chrome) sont conservés"""
+        data = self.load()
+        if not data:
+            return
+        rejected = data.setdefault('rejected_tokens', [])
+        if token_digest(token) not in rejected:
+            rejected.append(token_digest(token))
+            self._write(data)
+            logger.info("Jeton API de la session écarté - session Chrome conservée")
+
+    def load(self) -> Optional[Dict]:
+        """Retourne la session enregistrée si elle est lisible et non expirée"""
+        if not self.path.exists():
+            return None
+        from cryptography.fernet import InvalidToken
+        try:
+            raw = self.path.read_bytes()
+            data = json.loads(self._fernet(raw[:SALT_SIZE]).decrypt(raw[SALT_SIZE:]))
+        except (InvalidToken, ValueError) as e:
+            logger.warning(f"Session Spordle illisible, ignorée : {e}")
+            self.clear()
+            return None
+
+        if self.is_expired(data):
+            logger.info("Session Spordle expirée - nouvelle connexion requise")
+            self.clear()
+            return None
+        return data
+
+    def is_expired(self, data: Dict) -> bool:
+        """Vérifie l'âge de la session et l'expiration des cookies"""
+        now = time.time()
+        if now - data.get('saved_at', 0) > self.max_age:
+            return True
+        expiries = [c['expiry'] for c in data.get('cookies', []) if 'expiry' in c]
+        return bool(expiries) and max(expiries) <= now
+
+    def clear(self):
+        """Supprime la session enregistrée"""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+def token_digest(token: str) -> str:
+    """Empreinte d'un jeton (les jetons écartés ne sont pas conservés en clair)"""
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()[:16]
+
+def token_from_storage(local_storage: Dict, rejected: Iterable[str] = ()) -> Optional[str]:
+    """Retrouve le jeton d'accès dans le localStorage sauvegardé (JWT en premier, jetons écartés ignorés)"""
+    rejected = set(rejected)
+    candidates = [
+        value.strip('"') for key, value in local_storage.items()
+        if 'token' in key.lower() and isinstance(value, str) and value.strip('"')
+    ]
+    candidates = [token for token in candidates if token_digest(token) not in rejected]
+    jwts = [token for token in candidates if JWT_PATTERN.match(token)]
+    return (jwts or candidates or [None])[0]
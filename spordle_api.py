@@ -0,0 +1,227 @@
+"""
+Extraction des horaires Spordle via l'API JSON (sans navigateur)
+"""
+
+import json
+import logging
+from datetime import datetime, date, timedelta
+from typing import List, Dict, Optional
+from urllib.parse import urlparse, parse_qs
+from zoneinfo import ZoneInfo
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from models import Match, SpordleConfig
+from normalize import canonical_team
+from retry_policy import RetryPolicy
+from run_report import report
+from session_store import SessionStore, token_from_storage
+
+logger = logging.getLogger(__name__)
+
+# Fuseau des heures de match affichées sur play.spordle.com
+LOCAL_TIMEZONE = ZoneInfo("America/Toronto")
+
+class SpordleApiError(Exception):
+    """Erreur lors d'un appel à l'API Spordle"""
+    
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+class SpordleApiClient:
+    """Client HTTP pour l'API Spordle (session réutilisée, keep-alive)"""
+
+    def __init__(self, api_url: str, token: Optional[str] = None, timeout: float = 15, pool_maxsize: int = 4,
+                 retry_policy: Optional[RetryPolicy] = None):
+        self.api_url = api_url.rstrip('/')
+        self.timeout = timeout
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_maxsize)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'Accept': 'application/json',
+            'Origin': 'https://play.spordle.com',
+            'Referer': 'https://play.spordle.com/',
+        })
+        if token:
+            self.set_token(token)
+
+    def set_token(self, token: str):
+        """Définit le jeton d'authentification (Bearer)"""
+        self.session.headers['Authorization'] = f"Bearer {token}"
+
+    @property
+    def authenticated(self) -> bool:
+        return 'Authorization' in self.session.headers
+
+    def get(self, resource: str, params: Dict) -> list:
+        """Appelle une ressource de l'API et retourne le JSON décodé (relancé sur 5xx, 429 ou erreur réseau)"""
+        url = f"{self.api_url}/{resource.lstrip('/')}"
+        return self.retry_policy.call(self._get, url, params, description='api_spordle')
+    
+    def _get(self, url: str, params: Dict) -> list:
+        response = self.session.get(url, params=params, timeout=self.timeout)
+        if response.status_code in (401, 403):
+            raise SpordleApiError(f"Accès refusé par l'API Spordle ({response.status_code})", response.status_code)
+        if response.status_code != 200:
+            raise SpordleApiError(f"Réponse API Spordle: {response.status_code} - {response.text[:200]}", response.status_code)
+        return response.json()
+
+    def close(self):
+        self.session.close()
+
+def games_query_from_url(games_url: str) -> Dict:
+    """Reprend les paramètres filter/sort/order encodés dans SpordleConfig.games_url"""
+    query = parse_qs(urlparse(games_url).query)
+    games_filter = json.loads(query.get('filter', ['{}'])[0])
+    sort = query.get('sort', [])
+    order = query.get('order', [])
+    return {
+        'filter': games_filter,
+        'order': [f"{field} {direction}" for field, direction in zip(sort, order)],
+    }
+
+class SpordleApiExtractor:
+    """Extraction des matchs via l'API JSON, même interface que SpordleScheduleExtractor"""
+
+    def __init__(self, config: SpordleConfig, client: Optional[SpordleApiClient] = None):
+        self.config = config
+        # Un client fourni (déjà authentifié) est partagé entre plusieurs extracteurs et n'est pas fermé ici
+        self.owns_client = client is None
+        self.client = client or SpordleApiClient(config.api_url, retry_policy=config.retry_policy)
+        self.session_store = SessionStore(config.session_file, config.session_secret)
+        self.session_token: Optional[str] = None  # jeton tiré de la session Chrome persistée
+        self.query = games_query_from_url(config.games_url)
+
+    def start_driver(self) -> bool:
+        """Aucun navigateur à démarrer en mode API"""
+        return True
+
+    @report.timed()
+    def login(self) -> bool:
+        """S'authentifie une seule fois auprès de l'API"""
+        if self.client.authenticated:
+            return True
+        
+        token = self.config.api_token
+        if not token:
+            # Jeton de la dernière connexion Chrome, si la session persistée est encore valide
+            session = self.session_store.load()
+            token = token_from_storage(session['local_storage'], session.get('rejected_tokens', ())) if session else None
+            self.session_token = token
+        if not token:
+            logger.warning("Aucun jeton API Spordle (SPORDLE_API_TOKEN ou session persistée) - mode API indisponible")
+            return False
+        
+        self.client.set_token(token)
+        logger.info("✅ Jeton API Spordle chargé")
+        return True
+
+    @report.timed()
+    def fetch_games(self, start: date, end: date) -> List[Dict]:
+        """Récupère les matchs bruts entre deux dates (incluses)"""
+        where = dict(self.query['filter'])
+        include = sorted(set(where.pop('_include', [])) | {'homeTeam', 'awayTeam', 'arena'})
+        where['date'] = {'between': [start.isoformat(), end.isoformat()]}
+        params = {
+            'filter': json.dumps({'where': where, 'include': include, 'order': self.query['order']}),
+        }
+        try:
+            games = self.client.get('games', params)
+        except SpordleApiError as e:
+            if e.status_code in (401, 403) and self.session_token:
+                # Jeton refusé : seul ce jeton est écarté, les cookies Chrome restent valides.
+                # Une panne (5xx) ou une réponse invalide ne touche pas à la session
+                self.session_store.reject_token(self.session_token)
+            raise
+        logger.info(f"API Spordle : {len(games)} match(s) reçu(s) entre {start} et {end}")
+        return games
+
+    @report.timed()
+    def get_matches(self, test_date: Optional[datetime] = None) -> List[Match]:
+        """Retourne les matchs de la date demandée à partir de l'API"""
+        if test_date is None:
+            test_date = datetime.now()
+        target = test_date.date()
+        games = self.fetch_games(target, target)
+
+        matches = []
+        for game in games:
+            match = self._game_to_match(game, test_date)
+            if match:
+                matches.append(match)
+        matches.sort(key=lambda m: m.time)
+        return matches
+
+    def get_matches_range(self, start: date, end: date) -> Dict[date, List[Match]]:
+        """Récupère les matchs de chaque jour entre start et end (inclus) en un seul appel"""
+        matches_by_date: Dict[date, List[Match]] = {}
+        day = start
+        while day <= end:
+            matches_by_date[day] = []
+            day += timedelta(days=1)
+
+        for game in self.fetch_games(start, end):
+            try:
+                game_date = date.fromisoformat(str(game.get('date', ''))[:10])
+            except ValueError:
+                continue
+            if game_date not in matches_by_date:
+                continue
+            match = self._game_to_match(game, datetime.combine(game_date, datetime.min.time()))
+            if match:
+                matches_by_date[game_date].append(match)
+
+        for day_matches in matches_by_date.values():
+            day_matches.sort(key=lambda m: m.time)
+        return matches_by_date
+
+    def _game_to_match(self, game: Dict, test_date: datetime) -> Optional[Match]:
+        """Convertit un match JSON en objet Match (ignore les autres dates)"""
+        game_date = str(game.get('date', ''))[:10]
+        if game_date != test_date.strftime("%Y-%m-%d"):
+            return None
+
+        start_time = self._format_time(game.get('startTime'))
+        if not start_time:
+            return None
+
+        home_team = canonical_team(self._name_of(game.get('homeTeam')))
+        away_team = canonical_team(self._name_of(game.get('awayTeam')))
+        venue = self._name_of(game.get('arena'))
+
+        return Match(
+            date=test_date.strftime("%A, %B %d, %Y"),
+            time=start_time,
+            home_team=home_team,
+            away_team=away_team,
+            venue=venue,
+            full_text=str(game.get('number', '')),
+            test_mode=(test_date.date() != date.today())
+        )
+
+    @staticmethod
+    def _name_of(entity: Optional[Dict]) -> str:
+        if not entity:
+            return ""
+        return (entity.get('fullName') or entity.get('name') or "").strip()
+
+    @staticmethod
+    def _format_time(value) -> str:
+        """Normalise l'heure en HH:MM (ISO UTC ou heure locale)"""
+        if not value:
+            return ""
+        value = str(value)
+        if 'T' in value:
+            moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            if moment.tzinfo:
+                moment = moment.astimezone(LOCAL_TIMEZONE)
+            return moment.strftime("%H:%M")
+        return value[:5]
+
+    def close(self):
+        if self.owns_client:
+            self.client.close()
@@ -1,23 +1,37 @@
 
 
+import time
+_IMPORT_START = time.perf_counter()
+
 import os
 import sys
-import time
 import json
-import requests
+import math
+import hashlib
+from urllib.parse import urlencode
 from datetime import datetime, date, timedelta
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, TYPE_CHECKING
 import logging
-from dataclasses import dataclass
-from PIL import Image, ImageDraw
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 import io
 import re
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import undetected_chromedriver as uc
+from session_store import SessionStore
+from normalize import canonical_teams, canonical_time, canonical_venue, team_names
+from models import FacebookConfig, IMAGE_EXTENSIONS, Match, SponsorImage, SpordleConfig
+from retry_policy import failed_before_send, run_deadline
+from run_report import report
+from schedule_parser import parse_schedule_html, ScheduleSnapshot, DateSection
+
+# Modules lourds (selenium, undetected_chromedriver, PIL, requests, cryptography) importés seulement
+# par les étapes qui s'en servent : une exécution sans match ne les charge jamais
+if TYPE_CHECKING:
+    from PIL import Image
+    from media_pipeline import SponsorMediaPipeline
+
+# Temps d'importation de ce module (démarrage à froid), reporté dans le rapport d'exécution
+IMPORT_SECONDS = time.perf_counter() - _IMPORT_START
 
 # Configuration du logging (compatible Windows)
 logging.basicConfig(
@@ -46,57 +60,30 @@ DATE_SPECIFIQUE = None
 # ====================================================
 logger = logging.getLogger(__name__)
 
-@dataclass
-class Match:
-    """Représente un match de baseball"""
-    date: str
-    time: str
-    home_team: str
-    away_team: str
-    venue: str
-    full_text: str
-    test_mode: bool = False
-
-class SpordleConfig:
-    """Configuration pour Spordle"""
-    def __init__(self):
-        self.login_url = "https://myaccount.spordle.com/login?c=play&identity=0c74c85b-ba18-41f7-b170-e7b0dd3f4719&r=https%3A%2F%2Fplay.spordle.com%2Flogin%3Fu%3Dgunadeau%40hotmail.com&link=1"
-        self.password = os.getenv('SPORDLE_PASS')
-        self.games_url = "https://play.spordle.com/games?filter=%7B%22_include%22%3A%5B%22gameBracket%22%5D%2C%22homeTeamOffices%22%3A%5B3784%5D%2C%22seasonId%22%3A%222025-26%22%7D&order=ASC&order=ASC&order=ASC&page=1&perPage=25&sort=date&sort=startTime&sort=number"
-        
-        if not self.password:
-            raise ValueError("Variable d'environnement SPORDLE_PASS non définie")
-
-class FacebookConfig:
-    """Configuration pour Facebook"""
-    def __init__(self):
-        self.page_id = os.getenv('FACEBOOK_PAGE_ID')
-        self.access_token = os.getenv('FACEBOOK_ACCESS_TOKEN')
-        self.photo_api_url = f"https://graph.facebook.com/v22.0/{self.page_id}/photos"
-        self.feed_api_url = f"https://graph.facebook.com/v22.0/{self.page_id}/feed"
-        
-        if not self.page_id or not self.access_token:
-            raise ValueError("Variables d'environnement FACEBOOK_PAGE_ID ou FACEBOOK_ACCESS_TOKEN non définies")
-
 class ImageProcessor:
     """Classe pour traiter les images des commanditaires"""
     
+    # Extension de fichier par format d'encodage
+    EXTENSIONS = IMAGE_EXTENSIONS
+    
     @staticmethod
-    def resize_image(source_path: str, destination_path: str, target_size: int = 1200, target_aspect_ratio: float = 1.0) -> bool:
+    def render_image(source_path: str, target_size: int = 1200, target_aspect_ratio: float = 1.0) -> Optional['Image.Image']:
         """
-        Redimensionne une image et ajuste le ratio d'aspect
+        Redimensionne une image et la centre sur un canevas carré blanc (sans l'encoder)
         """
+        from PIL import Image
+        
         try:
             if not os.path.exists(source_path):
                 logger.warning(f"Le fichier {source_path} n'existe pas")
-                return False
+                return None
             
             with Image.open(source_path) as img:
                 original_width, original_height = img.size
                 
                 if original_width <= 0 or original_height <= 0:
                     logger.warning(f"Dimensions invalides pour {source_path}")
-                    return False
+                    return None
                 
                 original_aspect_ratio = original_width / original_height
                 logger.info(f"Image {source_path}: {original_width}x{original_height}, ratio={original_aspect_ratio:.2f}")
@@ -120,30 +107,255 @@ class ImageProcessor:
                 x_offset = (target_size - new_width) // 2
                 y_offset = (target_size - new_height) // 2
                 final_img.paste(resized_img, (x_offset, y_offset))
-                
-                # Sauvegarder
-                final_img.save(destination_path, 'PNG', quality=95)
-                
-                file_size = os.path.getsize(destination_path)
-                logger.info(f"Image sauvegardée: {destination_path} ({file_size/1024:.1f} KB)")
-                
-                return True
+                return final_img
                 
         except Exception as e:
             logger.error(f"Erreur lors du redimensionnement de {source_path}: {e}")
-            return False
+            return None
+    
+    @staticmethod
+    def encode_image(img: 'Image.Image', max_bytes: int, formats: Tuple[str, ...] = ('JPEG', 'PNG')) -> Tuple[bytes, str]:
+        """
+        Choisit le format selon le contenu et vise un budget en octets :
+        logos à aplats -> PNG palette optimisé, images photographiques -> JPEG/WebP à la meilleure qualité qui respecte le budget
+        """
+        # Aucun format reconnu : PNG (toujours possible)
+        formats = tuple(fmt for fmt in formats if fmt in IMAGE_EXTENSIONS) or ('PNG',)
+        candidates = []
+        
+        # Peu de couleurs distinctes : PNG palette sans perte visible
+        if 'PNG' in formats and img.getcolors(maxcolors=256) is not None:
+            buffer = io.BytesIO()
+            img.quantize(colors=256).save(buffer, 'PNG', optimize=True)
+            if buffer.tell() <= max_bytes:
+                return buffer.getvalue(), 'PNG'
+            candidates.append((buffer.getvalue(), 'PNG'))
+        
+        for fmt in ('WEBP', 'JPEG'):
+            if fmt not in formats:
+                continue
+            # Recherche dichotomique de la meilleure qualité sous le budget
+            low, high = 50, 92
+            best = None
+            while low <= high:
+                quality = (low + high) // 2
+                buffer = io.BytesIO()
+                options = {'quality': quality, 'optimize': True, 'progressive': True} if fmt == 'JPEG' else {'quality': quality, 'method': 4}
+                img.save(buffer, fmt, **options)
+                if buffer.tell() <= max_bytes:
+                    best = buffer.getvalue()
+                    low = quality + 1
+                else:
+                    candidates.append((buffer.getvalue(), fmt))
+                    high = quality - 1
+            if best is not None:
+                return best, fmt
+        
+        if 'PNG' in formats and not candidates:
+            buffer = io.BytesIO()
+            img.save(buffer, 'PNG', optimize=True)
+            candidates.append((buffer.getvalue(), 'PNG'))
+        
+        # Aucun format sous le budget : garder le plus léger
+        return min(candidates, key=lambda candidate: len(candidate[0]))
+
+class SponsorImageCache:
+    """Cache persistant des images de commanditaires rendues, indexé par le contenu de la source"""
+    
+    # À incrémenter si le rendu de ImageProcessor change (invalide le cache)
+    RENDER_VERSION = 2
+    
+    def __init__(self, cache_dir: str, max_bytes: int, image_budget: int = 300 * 1024, formats: Tuple[str, ...] = ('JPEG', 'PNG')):
+        # Dossier vide : aucun cache, rendu entièrement en mémoire
+        self.enabled = bool(cache_dir)
+        self.cache_dir = Path(cache_dir or '.')
+        if self.enabled:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.image_budget = image_budget
+        self.formats = tuple(formats)
+    
+    def _key(self, source_path: str, target_size: int, target_aspect_ratio: float) -> str:
+        digest = hashlib.sha256()
+        with open(source_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        digest.update(f"|{target_size}|{target_aspect_ratio:.4f}|{self.image_budget}|{','.join(self.formats)}|v{self.RENDER_VERSION}".encode())
+        return digest.hexdigest()[:32]
+    
+    def _entries(self):
+        return (p for p in self.cache_dir.iterdir() if p.is_file() and not p.name.endswith('.tmp'))
+    
+    def get_or_render(self, source_path: str, target_size: int = 1200, target_aspect_ratio: float = 1.0, evict: bool = True) -> Optional[SponsorImage]:
+        """Retourne l'image encodée (en mémoire), en la générant seulement si la source a changé"""
+        if not os.path.exists(source_path):
+            logger.warning(f"Le fichier {source_path} n'existe pas")
+            return None
+        
+        name = Path(source_path).stem
+        key = self._key(source_path, target_size, target_aspect_ratio) if self.enabled else None
+        if self.enabled:
+            cached_path = next((p for p in self.cache_dir.glob(f"{key}.*") if not p.name.endswith('.tmp')), None)
+            if cached_path:
+                os.utime(cached_path)  # Marque l'entrée comme récemment utilisée
+                logger.info(f"Image en cache réutilisée : {source_path} -> {cached_path.name}")
+                fmt = next(f for f, ext in ImageProcessor.EXTENSIONS.items() if ext == cached_path.suffix[1:])
+                return SponsorImage(name, cached_path.read_bytes(), fmt, str(cached_path))
+        
+        final_img = ImageProcessor.render_image(source_path, target_size, target_aspect_ratio)
+        if final_img is None:
+            return None
+        data, fmt = ImageProcessor.encode_image(final_img, self.image_budget, self.formats)
+        
+        # Économie estimée par rapport au fichier source (aucun encodage supplémentaire)
+        source_bytes = os.path.getsize(source_path)
+        saved = source_bytes - len(data)
+        logger.info(f"Image encodée en {fmt} : {len(data)/1024:.1f} KB (source : {source_bytes/1024:.1f} KB, {saved/1024:.1f} KB économisés)")
+        
+        image = SponsorImage(name, data, fmt)
+        if not self.enabled:
+            return image
+        
+        # L'image est conservée en mémoire pour l'envoi ; le fichier sert seulement aux prochaines exécutions
+        cached_path = self.cache_dir / f"{key}.{ImageProcessor.EXTENSIONS[fmt]}"
+        tmp_path = self.cache_dir / f"{key}.tmp"
+        tmp_path.write_bytes(data)
+        tmp_path.replace(cached_path)
+        image.cache_path = str(cached_path)
+        if evict:
+            self.evict(keep=cached_path)
+        return image
+    
+    def evict(self, keep=None):
+        """Supprime les entrées les moins récemment utilisées au-delà de la taille maximale"""
+        if not self.enabled:
+            return
+        keep = [keep] if isinstance(keep, Path) else list(keep or [])
+        entries = sorted((p for p in self._entries() if p not in keep), key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in entries) + sum(p.stat().st_size for p in keep if p.exists())
+        while entries and total > self.max_bytes:
+            oldest = entries.pop(0)
+            total -= oldest.stat().st_size
+            oldest.unlink()
+            logger.info(f"Cache d'images : {oldest.name} évincé")
+
+class PageReadiness:
+    """Attentes conditionnelles sur des signaux concrets de la page (remplace les time.sleep fixes)"""
+    
+    # Nombre de ressources chargées par la page (API Resource Timing)
+    _RESOURCE_COUNT_SCRIPT = "return [document.readyState, performance.getEntriesByType('resource').length];"
+    
+    def __init__(self, driver, poll_frequency: float = 0.25):
+        self.driver = driver
+        self.poll_frequency = poll_frequency
+        # Durée cumulée et nombre d'attentes par étape (une attente par page avec la pagination)
+        self.timings: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+    
+    def wait_for(self, stage: str, condition, timeout: float):
+        """Attend qu'une condition soit remplie, enregistre la durée de l'étape et retourne sa valeur (False si plafond atteint)"""
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.support.ui import WebDriverWait
+        
+        timeout = run_deadline.cap(timeout)
+        start = time.perf_counter()
+        try:
+            ready = WebDriverWait(self.driver, timeout, poll_frequency=self.poll_frequency).until(condition)
+        except TimeoutException:
+            ready = False
+        elapsed = time.perf_counter() - start
+        self.timings[stage] = self.timings.get(stage, 0.0) + elapsed
+        self.counts[stage] = self.counts.get(stage, 0) + 1
+        
+        if ready:
+            logger.info(f"⏱️ {stage} : prêt en {elapsed:.2f}s")
+        else:
+            logger.warning(f"⏱️ {stage} : plafond de {timeout:.0f}s atteint sans signal")
+        return ready
+    
+    def password_field(self, timeout: float) -> bool:
+        """Attend que le champ mot de passe soit présent"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        return self.wait_for("champ mot de passe", EC.presence_of_element_located((By.NAME, "password")), timeout)
+    
+    def redirected_to(self, host: str, timeout: float) -> bool:
+        """Attend la redirection vers l'hôte donné"""
+        from selenium.webdriver.support import expected_conditions as EC
+        return self.wait_for(f"redirection {host}", EC.url_contains(host), timeout)
+    
+    def games_table(self, timeout: float) -> bool:
+        """Attend le rendu du premier tableau MUI (ou d'un en-tête de date)"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        return self.wait_for("tableau des matchs", EC.any_of(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "table.MuiTable-root")),
+            EC.presence_of_element_located((By.CSS_SELECTOR, "h6.MuiTypography-subtitle2"))
+        ), timeout)
+    
+    def network_idle(self, timeout: float, quiet_period: float = 0.5) -> bool:
+        """Attend que le document soit chargé et qu'aucune nouvelle ressource n'arrive pendant quiet_period"""
+        state = {'count': -1, 'since': time.perf_counter()}
+        
+        def _idle(driver):
+            ready_state, count = driver.execute_script(self._RESOURCE_COUNT_SCRIPT)
+            now = time.perf_counter()
+            if count != state['count']:
+                state['count'] = count
+                state['since'] = now
+                return False
+            return ready_state == 'complete' and now - state['since'] >= quiet_period
+        
+        return self.wait_for("réseau inactif", _idle, timeout)
+    
+    def log_summary(self):
+        """Affiche la durée cumulée de chaque étape d'attente depuis le dernier résumé, puis la remet à zéro"""
+        if not self.timings:
+            return
+        total = sum(self.timings.values())
+        details = ", ".join(
+            f"{stage}={elapsed:.2f}s" + (f" ({self.counts[stage]} attentes)" if self.counts[stage] > 1 else "")
+            for stage, elapsed in self.timings.items()
+        )
+        logger.info(f"⏱️ Temps d'attente total : {total:.2f}s ({details})")
+        # Extracteur réutilisé (pool de navigateurs) : chaque extraction a son propre résumé
+        self.timings.clear()
+        self.counts.clear()
+
+# Diagnostic SPORDLE_DEBUG : dates repérées par expression régulière dans le HTML brut
+HTML_DATE_PATTERN = re.compile(r'\w+day,\s+\w+\s+\d{1,2},\s+\d{4}')
+HTML_ALT_DATE_PATTERN = re.compile(r'\w+\s+\d{1,2},?\s+20\d{2}|20\d{2}-\d{2}-\d{2}|\d{1,2}/\d{1,2}/20\d{2}')
 
 class SpordleScheduleExtractor:
     """Classe pour extraire les horaires de Spordle"""
     
+    # Ressources inutiles pour lire l'horaire : images, polices, statistiques et tiers
+    BLOCKED_URL_PATTERNS = [
+        '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+        '*.woff', '*.woff2', '*.ttf', '*.otf', '*fonts.googleapis.com*', '*fonts.gstatic.com*',
+        '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*connect.facebook.net*',
+        '*hotjar.com*', '*segment.io*', '*intercom.io*', '*sentry.io*', '*clarity.ms*', '*newrelic.com*', '*nr-data.net*',
+    ]
+    
     def __init__(self, config: SpordleConfig):
         self.config = config
         self.driver = None
+        self.readiness: Optional[PageReadiness] = None
+        self.session_store = SessionStore(config.session_file, config.session_secret)
+        self.games_page_loaded = False
+        self.page_load_timeout: Optional[int] = None  # délai déjà appliqué au driver
+        self.network_stats = {'requests': 0, 'blocked': 0, 'transferred_bytes': 0}
+        # Par type de ressource (Script, Image, Font...) : [octets reçus, requêtes chargées] et requêtes bloquées
+        self.loaded_by_type: Dict[str, List[int]] = {}
+        self.blocked_by_type: Dict[str, int] = {}
         self.safety_mode = True
         self.date_validated = False
     
+    @report.timed()
     def start_driver(self) -> bool:
         """Démarre le driver Chrome"""
+        import undetected_chromedriver as uc
+        
         try:
             options = uc.ChromeOptions()
             options.add_argument('--disable-blink-features=AutomationControlled')
@@ -160,48 +372,147 @@ class SpordleScheduleExtractor:
                 options.add_argument('--window-size=1920,1080')
                 logger.info("Mode GitHub Actions détecté - Chrome en mode headless")
             
-            self.driver = uc.Chrome(options=options)
+            # Profil de scraping allégé : pas d'images, DOM prêt suffit, journal réseau pour le bilan
+            if self.config.scrape_profile:
+                options.page_load_strategy = 'eager'
+                options.add_experimental_option('prefs', {
+                    'profile.managed_default_content_settings.images': 2,
+                    'profile.default_content_setting_values.notifications': 2,
+                })
+                options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+            
+            # ChromeDriver provisionné par sync_chromedriver.py (cache versionné), sinon téléchargement par uc
+            driver_path = os.getenv('CHROMEDRIVER_PATH')
+            if driver_path and os.path.exists(driver_path):
+                self.driver = uc.Chrome(options=options, driver_executable_path=driver_path)
+            else:
+                self.driver = uc.Chrome(options=options)
+            self.readiness = PageReadiness(self.driver)
+            
+            if self.config.scrape_profile:
+                self.driver.execute_cdp_cmd('Network.enable', {})
+                self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.BLOCKED_URL_PATTERNS})
+                logger.info(f"Profil de scraping allégé : {len(self.BLOCKED_URL_PATTERNS)} motifs de ressources bloqués")
             logger.info("Driver Chrome démarré avec succès")
             return True
         except Exception as e:
             logger.error(f"Erreur lors du démarrage du driver: {e}")
             return False
     
+    @report.timed()
     def login(self) -> bool:
-        """Se connecte à Spordle"""
+        """Se connecte à Spordle (session persistée si encore valide, sinon connexion complète)"""
+        if self._restore_session():
+            return True
+        
         try:
-            logger.info("=== CONNEXION À SPORDLE ===")
-            self.driver.get(self.config.login_url)
-            logger.info(f"Page de connexion chargée: {self.config.login_url}")
-            time.sleep(3)
-            
-            # Saisir le mot de passe
-            password_field = self.driver.find_element(By.NAME, "password")
-            password_field.send_keys(self.config.password)
-            logger.info("Mot de passe saisi")
-            
-            password_field.submit()
-            logger.info("Connexion envoyée")
-            time.sleep(5)
-            
-            # Vérifier la connexion
-            current_url = self.driver.current_url
-            logger.info(f"URL après connexion: {current_url}")
-            
-            if "play.spordle.com" in current_url:
-                logger.info("✅ Connexion à Spordle réussie!")
-                return True
-            else:
-                logger.warning("❌ Connexion à Spordle échouée")
-                return False
-                
+            # Formulaire lent ou redirection manquée : connexion complète reprise depuis le début
+            return self.config.retry_policy.call(self._submit_login, description='login')
         except Exception as e:
             logger.error(f"Erreur lors de la connexion: {e}")
             return False
     
-    def get_matches(self, test_date: Optional[datetime] = None) -> List[Match]:
+    def _submit_login(self) -> bool:
+        """Une tentative de connexion ; les délais d'attente sont levés pour être relancés"""
+        from selenium.webdriver.common.by import By
+        
+        logger.info("=== CONNEXION À SPORDLE ===")
+        self._navigate(self.config.login_url)
+        logger.info(f"Page de connexion chargée: {self.config.login_url}")
+        self.readiness.password_field(self.config.login_form_timeout)
+        
+        # Saisir le mot de passe
+        password_field = self.driver.find_element(By.NAME, "password")
+        password_field.send_keys(self.config.password)
+        logger.info("Mot de passe saisi")
+        
+        password_field.submit()
+        logger.info("Connexion envoyée")
+        self.readiness.redirected_to("play.spordle.com", self.config.login_redirect_timeout)
+        
+        # Vérifier la connexion
+        current_url = self.driver.current_url
+        logger.info(f"URL après connexion: {current_url}")
+        
+        if "play.spordle.com" in current_url:
+            logger.info("✅ Connexion à Spordle réussie!")
+            self._save_session()
+            return True
+        
+        logger.warning("❌ Connexion à Spordle échouée")
+        return False
+    
+    def _navigate(self, url: str):
+        """driver.get borné par le temps restant de l'étape (sinon Chrome attend indéfiniment le chargement)"""
+        timeout = max(1, math.ceil(run_deadline.cap(self.config.page_load_timeout)))
+        if timeout != self.page_load_timeout:
+            # Un appel au driver seulement quand le plafond change (fin d'étape proche)
+            self.driver.set_page_load_timeout(timeout)
+            self.page_load_timeout = timeout
+        self.driver.get(url)
+    
+    def _restore_session(self) -> bool:
+        """Recharge les cookies/localStorage sauvegardés et vérifie que Spordle les accepte"""
+        session = self.session_store.load()
+        if not session:
+            return False
+        
+        try:
+            logger.info("=== RESTAURATION DE LA SESSION SPORDLE ===")
+            # Le domaine doit être chargé avant d'y ajouter des cookies
+            self._navigate("https://play.spordle.com/404")
+            for cookie in session['cookies']:
+                try:
+                    self.driver.add_cookie(cookie)
+                except Exception as e:
+                    logger.info(f"DEBUG: Cookie ignoré ({cookie.get('name')}): {e}")
+            for key, value in session['local_storage'].items():
+                self.driver.execute_script("window.localStorage.setItem(arguments[0], arguments[1]);", key, value)
+            
+            # Charger directement la page des matchs : redirection vers la connexion = session rejetée
+            self._navigate(self.config.games_url)
+            state = self.readiness.wait_for("validation session", self._session_state, self.config.login_redirect_timeout)
+            if state == 'accepted':
+                logger.info("✅ Session Spordle restaurée - connexion évitée")
+                self.games_page_loaded = True
+                return True
+            
+            logger.info("Session Spordle rejetée - nouvelle connexion")
+        except Exception as e:
+            logger.warning(f"Erreur lors de la restauration de la session : {e}")
+        
+        self.session_store.clear()
+        self.driver.delete_all_cookies()
+        return False
+    
+    @staticmethod
+    def _session_state(driver):
+        """Condition d'attente : 'rejected' si renvoyé vers la connexion, 'accepted' si la page des matchs s'affiche"""
+        from selenium.webdriver.common.by import By
+        
+        url = driver.current_url
+        if "myaccount.spordle.com" in url or "/login" in url:
+            return 'rejected'
+        if driver.find_elements(By.CSS_SELECTOR, "table.MuiTable-root, h6.MuiTypography-subtitle2"):
+            return 'accepted'
+        return False
+    
+    def _save_session(self):
+        """Sauvegarde les cookies et le localStorage après une connexion réussie"""
+        try:
+            cookies = self.driver.get_cookies()
+            local_storage = self.driver.execute_script("return Object.assign({}, window.localStorage);")
+            self.session_store.save(cookies, local_storage)
+        except Exception as e:
+            logger.warning(f"Impossible de sauvegarder la session : {e}")
+    
+    @report.timed()
+    def get_matches(self, test_date: Optional[datetime] = None) -> Optional[List[Match]]:
         """
         Version BULLETPROOF de l'extraction des matchs avec paramètre de date pour tests
+
+        Retourne [] seulement si la liste chargée couvre la date sans la contenir (aucun match ce jour-là) ;
+        None si l'horaire n'a pas pu être chargé ou validé (page lente, erreur) : repli sur le cache.
         """
         if test_date is None:
             test_date = datetime.now()
@@ -210,13 +521,11 @@ class SpordleScheduleExtractor:
         self.safety_mode = True
         self.date_validated = False
         matches_today = []
-        all_date_elements = []  # Initialiser ici pour éviter l'erreur
+        schedule_loaded = False  # liste chargée jusqu'à la date recherchée au moins
+        snapshot: Optional[ScheduleSnapshot] = None
+        today_section: Optional[DateSection] = None
         
         try:
-            logger.info("Navigation vers la page des matchs...")
-            self.driver.get(self.config.games_url)
-            time.sleep(7)
-            
             logger.info("Recherche des matchs du jour...")
             
             # Formater la date à rechercher (avec et sans zéro initial)
@@ -229,27 +538,30 @@ class SpordleScheduleExtractor:
             logger.info(f"DEBUG: Date recherchée : '{today_formatted}' ou '{today_formatted2}'")
             logger.info(f"DEBUG: SAFETY_MODE = {self.safety_mode}")
             
-            time.sleep(3)
-            
             # ÉTAPE 1 : VÉRIFICATION HTML BRUT
             logger.info("DEBUG: === ÉTAPE 1 : VÉRIFICATION HTML BRUT ===")
-            page_source = self.driver.page_source
+            page_source, snapshot, covered_until = self._load_pages_until(test_date.date())
             
-            # Debug: Afficher des extraits de HTML qui contiennent des dates
-            import re
-            date_patterns = re.findall(r'\w+day,\s+\w+\s+\d{1,2},\s+\d{4}', page_source)
-            logger.info(f"DEBUG: Dates trouvées dans le HTML : {date_patterns}")
+            # Diagnostic (SPORDLE_DEBUG=1) : balayage complet du HTML à la recherche de dates
+            if self.config.debug:
+                self._log_html_dates(page_source, today_formatted, today_formatted2)
             
-            # Chercher également des formats de date alternatifs
-            alt_date_patterns = re.findall(r'July\s+\d{1,2},?\s+2025|2025-\d{2}-\d{2}|\d{1,2}/\d{1,2}/2025', page_source)
-            logger.info(f"DEBUG: Dates alternatives trouvées : {alt_date_patterns}")
+            # Index des en-têtes construit en une passe par l'analyse de la page : recherche O(1)
+            today_section = snapshot.find(today_formatted, today_formatted2) or snapshot.section_for(test_date.date())
+            date_in_html = today_section is not None
             
-            date_in_html = today_formatted in page_source or today_formatted2 in page_source
+            # Journée coupée par une page non chargée (ou aucune page rendue) : une liste partielle ne doit
+            # jamais être publiée, ni une date absente être prise pour une journée sans match
+            schedule_loaded = covered_until is not None and covered_until >= test_date.date()
+            if not schedule_loaded:
+                logger.warning(f"Horaire incomplet : pages chargées jusqu'au {covered_until} seulement")
+                today_section = None
+                date_in_html = False
             
             if date_in_html:
-                logger.info("DEBUG: Date d'aujourd'hui trouvée dans le HTML brut")
+                logger.info("DEBUG: Date d'aujourd'hui trouvée dans l'index des en-têtes")
             else:
-                logger.info("DEBUG: Date d'aujourd'hui NON trouvée dans le HTML brut")
+                logger.info("DEBUG: Date d'aujourd'hui NON trouvée dans l'index des en-têtes")
             
             # ÉTAPE 2 : VALIDATION DE SÉCURITÉ
             logger.info("DEBUG: === ÉTAPE 2 : VALIDATION DE SÉCURITÉ ===")
@@ -260,32 +572,15 @@ class SpordleScheduleExtractor:
             else:
                 logger.info("DEBUG: Date trouvée dans HTML - Validation DOM en cours...")
                 
-                # ÉTAPE 3 : VÉRIFICATION DOM
+                # ÉTAPE 3 : VÉRIFICATION DOM (analyse locale du HTML déjà récupéré)
                 logger.info("DEBUG: === ÉTAPE 3 : VÉRIFICATION DOM ===")
-                date_selector_patterns = [
-                    "//h6[contains(@class, 'MuiTypography-subtitle2') and contains(@class, 'MuiTypography-displayInline')]",
-                    "//h6[contains(@class, 'MuiTypography-root') and contains(text(), '2025')]"
-                ]
+                if self.config.debug:
+                    for text in snapshot.date_texts:
+                        logger.info(f"DEBUG: Élément de date DOM trouvé : '{text}'")
                 
-                today_date_found = False
-                for pattern in date_selector_patterns:
-                    try:
-                        elements = self.driver.find_elements(By.XPATH, pattern)
-                        for el in elements:
-                            text = el.text.strip()
-                            if re.match(r'\w+day,.*\d{4}', text) and len(text) < 100:
-                                all_date_elements.append({
-                                    'element': el,
-                                    'text': text
-                                })
-                                logger.info(f"DEBUG: Élément de date DOM trouvé : '{text}'")
-                                
-                                # Vérifier si c'est la date d'aujourd'hui
-                                if text == today_formatted or text == today_formatted2:
-                                    today_date_found = True
-                                    logger.info(f"DEBUG: DATE D'AUJOURD'HUI CONFIRMÉE DOM : '{text}'")
-                    except Exception as e:
-                        logger.info(f"DEBUG: Erreur avec pattern '{pattern}': {e}")
+                today_date_found = today_section is not None
+                if today_date_found:
+                    logger.info(f"DEBUG: DATE D'AUJOURD'HUI CONFIRMÉE DOM : '{today_section.date_text}'")
                 
                 # VALIDATION FINALE
                 if today_date_found:
@@ -309,8 +604,8 @@ class SpordleScheduleExtractor:
                 
                 # Diagnostic des dates disponibles
                 logger.info("=== DATES DISPONIBLES ===")
-                for date_info in all_date_elements:
-                    logger.info(f"Date disponible : '{date_info['text']}'")
+                for text in (snapshot.date_texts if snapshot else []):
+                    logger.info(f"Date disponible : '{text}'")
                 
                 # Sauvegarde debug
                 temp_folder = Path("temp")
@@ -325,23 +620,29 @@ class SpordleScheduleExtractor:
                 logger.info("DEBUG: Recherche du tableau de matchs...")
                 
                 # EXTRACTION RÉELLE DES MATCHS
-                matches_today = self._extract_matches_from_dom(all_date_elements, today_formatted, today_formatted2, test_date)
+                matches_today = self._extract_matches_from_dom(today_section, today_formatted, test_date)
         
         except Exception as e:
             logger.error(f"Erreur CRITIQUE : {e}")
             self.safety_mode = True
             self.date_validated = False
             matches_today = []
+            schedule_loaded = False
         
         # ÉTAPE 5 : RETOUR SÉCURISÉ
         logger.info("DEBUG: === ÉTAPE 5 : RETOUR SÉCURISÉ ===")
+        if self.readiness:
+            self.readiness.log_summary()
         logger.info(f"DEBUG: SAFETY_MODE final = {self.safety_mode}")
         logger.info(f"DEBUG: DATE_VALIDATED final = {self.date_validated}")
         logger.info(f"DEBUG: matches_today count = {len(matches_today)}")
         
         # VÉRIFICATION FINALE ABSOLUE
         if self.safety_mode:
-            logger.info("DEBUG: SAFETY_MODE - Retour tableau vide garanti")
+            if not schedule_loaded:
+                logger.warning("Horaire non chargé ou non validé - échec de l'extraction (aucune journée vide supposée)")
+                return None
+            logger.info("DEBUG: SAFETY_MODE - Date absente d'un horaire complet : aucun match ce jour-là")
             matches_today = []
         
         if matches_today and not self.date_validated:
@@ -352,142 +653,227 @@ class SpordleScheduleExtractor:
         logger.info(f"DEBUG: Nombre de matchs retournés : {len(matches_today)}")
         return matches_today
     
-    def _extract_matches_from_dom(self, all_date_elements: List[Dict], today_formatted: str, today_formatted2: str, test_date: datetime) -> List[Match]:
-        """Extrait les matchs du DOM"""
-        matches = []
-        
+    @staticmethod
+    def _log_html_dates(page_source: str, *date_texts: str):
+        """Diagnostic : dates présentes dans le HTML brut (plusieurs balayages complets de la page)"""
+        logger.info(f"DEBUG: Dates trouvées dans le HTML : {HTML_DATE_PATTERN.findall(page_source)}")
+        logger.info(f"DEBUG: Dates alternatives trouvées : {HTML_ALT_DATE_PATTERN.findall(page_source)}")
+        found = any(date_text in page_source for date_text in date_texts)
+        logger.info(f"DEBUG: Date recherchée {'présente' if found else 'absente'} dans le HTML brut")
+    
+    @report.timed()
+    def get_matches_range(self, start: date, end: date) -> Dict[date, List[Match]]:
+        """Récupère les matchs de chaque jour entre start et end (inclus) dans la même session
+
+        Seules les dates couvertes par les pages chargées sont retournées ({} si aucun tableau n'a été rendu) :
+        une page incomplète ne doit jamais passer pour des journées sans match.
+        """
+        matches_by_date: Dict[date, List[Match]] = {}
         try:
-            # Trouver l'élément de date d'aujourd'hui
-            today_date_element = None
-            for date_info in all_date_elements:
-                if date_info['text'] == today_formatted or date_info['text'] == today_formatted2:
-                    today_date_element = date_info['element']
-                    break
-            
-            if not today_date_element:
-                logger.warning("❌ Impossible de retrouver l'élément de date")
-                return matches
-            
-            # Trouver le tableau associé
-            table_element = None
-            table_search_patterns = [
-                "./following-sibling::table[contains(@class, 'MuiTable-root')][1]",
-                "./following::table[contains(@class, 'MuiTable-root')][1]",
-                "./..//table[contains(@class, 'MuiTable-root')][1]",
-                "./ancestor::div[1]//table[contains(@class, 'MuiTable-root')][1]"
-            ]
-            
-            for table_pattern in table_search_patterns:
-                try:
-                    table_element = today_date_element.find_element(By.XPATH, table_pattern)
-                    if table_element:
-                        logger.info(f"DEBUG: ✅ Tableau trouvé avec pattern : '{table_pattern}'")
-                        break
-                except:
-                    # Pattern ne fonctionne pas, essayer le suivant
-                    pass
-            
-            if not table_element:
-                logger.warning("❌ Aucun tableau trouvé pour la date d'aujourd'hui")
-                return matches
+            _, snapshot, covered_until = self._load_pages_until(end)
+            if covered_until is None:
+                logger.error(f"Aucun tableau de matchs chargé pour la période {start} - {end}")
+                return {}
+            if covered_until < end:
+                logger.warning(f"Pages chargées jusqu'au {covered_until} seulement - dates suivantes ignorées")
             
-            # Extraire les matchs du tableau
-            table_rows = table_element.find_elements(By.XPATH, ".//tr[contains(@class, 'MuiTableRow-root')]")
-            logger.info(f"DEBUG: Nombre de lignes dans le tableau : {len(table_rows)}")
+            day = start
+            while day <= min(end, covered_until):
+                matches_by_date[day] = []
+                day += timedelta(days=1)
             
-            for row in table_rows:
-                try:
-                    # Extraire l'heure
-                    time_cells = row.find_elements(By.XPATH, ".//td[contains(@class, 'column-time')]//span[contains(@class, 'MuiTypography-noWrap')]")
-                    if not time_cells:
-                        continue
-                    
-                    time_text = time_cells[0].text.strip()
-                    start_time = time_text
-                    time_match = re.match(r'^(\d{1,2}:\d{2})', time_text)
-                    if time_match:
-                        start_time = time_match.group(1)
-                    
-                    # Extraire les équipes
-                    team_elements = row.find_elements(By.XPATH, ".//td[contains(@class, 'column-homeTeamId')]//p[contains(@class, 'MuiTypography-displayInline')]")
-                    teams = []
-                    for team_el in team_elements:
-                        team_text = team_el.text.strip()
-                        if (re.match(r'TITANS|[A-Z]+.*\d+.*[A-Z]', team_text) and 
-                            not re.match(r'^Game|^Parc|^Terrain', team_text)):
-                            teams.append(team_text)
-                    
-                    # Extraire le lieu
-                    venue_elements = row.find_elements(By.XPATH, ".//td[contains(@class, 'column-arenaId')]//p[contains(@class, 'MuiTypography-displayInline')][1]")
-                    venue = venue_elements[0].text.strip() if venue_elements else ""
-                    
-                    # Créer l'objet match
-                    match_info = Match(
-                        date=today_formatted,
-                        time=start_time,
-                        home_team="",
-                        away_team="",
-                        venue=venue,
-                        full_text=time_text,
-                        test_mode=(test_date.date() != date.today())
+            # Une recherche dans l'index des en-têtes par date demandée, sans reparcourir la page
+            for day in matches_by_date:
+                section = snapshot.section_for(day)
+                if section:
+                    matches_by_date[day] = self._extract_matches_from_dom(
+                        section, day.strftime("%A, %B %d, %Y"), datetime.combine(day, datetime.min.time())
                     )
-                    
-                    # Assigner les équipes
-                    if len(teams) >= 2:
-                        match_info.home_team = teams[0]
-                        match_info.away_team = teams[1]
-                    elif len(teams) == 1:
-                        match_info.home_team = teams[0]
-                    
-                    # Simplifier les noms d'équipes
-                    match_info.home_team = self._simplify_team_name(match_info.home_team)
-                    match_info.away_team = self._simplify_team_name(match_info.away_team)
-                    
-                    # Ajouter le match s'il a une heure valide
-                    if match_info.time:
-                        matches.append(match_info)
-                        logger.info(f"DEBUG: ✅ Match ajouté : '{match_info.home_team}' vs '{match_info.away_team}' à '{match_info.time}'")
-                
-                except Exception as e:
-                    logger.warning(f"Erreur lors de l'analyse d'une ligne : {e}")
-        
         except Exception as e:
-            logger.warning(f"Erreur lors de l'extraction des matchs : {e}")
+            # Aucune date retournée : ne pas confondre un échec avec une journée sans match
+            logger.error(f"Erreur lors de l'extraction de la période {start} - {end} : {e}")
+            return {}
         
-        return matches
+        total = sum(len(day_matches) for day_matches in matches_by_date.values())
+        logger.info(f"{total} match(s) trouvé(s) entre {start} et {end}")
+        return matches_by_date
     
-    def _simplify_team_name(self, team_name: str) -> str:
-        """Simplifie le nom d'une équipe"""
-        if not team_name:
-            return team_name
+    @report.timed('page_load')
+    def _load_games_page(self, page: int) -> Tuple[str, ScheduleSnapshot]:
+        """Charge une page de résultats et l'analyse localement"""
+        if page == 1 and self.games_page_loaded:
+            logger.info("Page des matchs déjà chargée par la restauration de session")
+        else:
+            logger.info(f"Navigation vers la page des matchs (page {page})...")
+            self.config.retry_policy.call(self._navigate, self.config.games_page_url(page), description='page_load')
+        self.games_page_loaded = False
+        self.readiness.games_table(self.config.games_table_timeout)
+        self.readiness.network_idle(self.config.network_idle_timeout)
         
-        # Pattern pour "TOROS 3 - 9U - B - Masculin - LOTBINIÈRE" -> "TOROS 3 9UB"
-        match = re.match(r'^([A-Z]+(?:\s+\d+)?).*?(\d+U).*?([AB])', team_name)
-        if match:
-            team_name_part = match.group(1).strip()
-            age_group = match.group(2)
-            division = match.group(3)
-            simplified = f"{team_name_part} {age_group}{division}"
-            logger.info(f"DEBUG: Nom d'équipe simplifié : '{simplified}'")
-            return simplified
+        if self._session_state(self.driver) == 'rejected':
+            raise RuntimeError("Session Spordle expirée - redirection vers la page de connexion")
         
-        return team_name
+        page_source = self.driver.page_source
+        self._collect_network_stats()
+        return page_source, parse_schedule_html(page_source)
+    
+    def _load_pages_until(self, end: date) -> Tuple[str, ScheduleSnapshot, Optional[date]]:
+        """Parcourt les pages (triées par date) jusqu'à dépasser end ou atteindre la dernière page
+
+        Retourne aussi la dernière date dont l'horaire est complet (None si aucun tableau n'a été chargé).
+        """
+        sources = []
+        snapshots = []
+        covered_until = None
+        for page in range(1, self.config.max_pages + 1):
+            page_source, snapshot = self._load_games_page(page)
+            sources.append(page_source)
+            
+            last_date = snapshot.last_date
+            logger.info(f"DEBUG: Page {page} : {snapshot.game_count} match(s), dernière date {last_date}")
+            if not snapshot.has_table or last_date is None:
+                # Page non rendue ("Loading...") : seules les pages précédentes sont fiables
+                logger.warning(f"Page {page} sans tableau de matchs daté")
+                break
+            snapshots.append(snapshot)
+            if last_date > end or snapshot.game_count < self.config.per_page:
+                # Date dépassée ou dernière page de la liste : toute la période est couverte
+                covered_until = end
+                break
+            # La dernière date de la page peut se poursuivre sur la page suivante
+            covered_until = last_date - timedelta(days=1)
+        else:
+            logger.warning(f"Limite de {self.config.max_pages} pages atteinte avant la date {end}")
+        
+        return "".join(sources), ScheduleSnapshot.merge(snapshots), covered_until
+    
+    @report.timed()
+    def _extract_matches_from_dom(self, today_section: DateSection, today_formatted: str, test_date: datetime) -> List[Match]:
+        """Extrait les matchs des lignes du tableau de la date (déjà analysées localement)"""
+        matches = []
+        
+        if not today_section.has_table:
+            logger.warning("❌ Aucun tableau trouvé pour la date d'aujourd'hui")
+            return matches
+        
+        logger.info(f"DEBUG: Nombre de lignes dans le tableau : {len(today_section.rows)}")
+        
+        # Lignes avec une heure ; les noms sont ensuite normalisés par colonne entière
+        rows = [row for row in today_section.rows if row.times]
+        teams = [team_names(row.teams) for row in rows]
+        home_teams = canonical_teams(row_teams[0] if row_teams else "" for row_teams in teams)
+        away_teams = canonical_teams(row_teams[1] if len(row_teams) >= 2 else "" for row_teams in teams)
+        
+        for row, home_team, away_team in zip(rows, home_teams, away_teams):
+            try:
+                time_text = row.times[0]
+                match_info = Match(
+                    date=today_formatted,
+                    time=canonical_time(time_text),
+                    home_team=home_team,
+                    away_team=away_team,
+                    venue=row.venues[0] if row.venues else "",
+                    full_text=time_text,
+                    test_mode=(test_date.date() != date.today())
+                )
+                
+                # Ajouter le match s'il a une heure valide
+                if match_info.time:
+                    matches.append(match_info)
+                    logger.info(f"DEBUG: ✅ Match ajouté : '{match_info.home_team}' vs '{match_info.away_team}' à '{match_info.time}'")
+            
+            except Exception as e:
+                logger.warning(f"Erreur lors de l'analyse d'une ligne : {e}")
+        
+        return matches
+    
+    def _collect_network_stats(self):
+        """Cumule les requêtes chargées (octets reçus selon Chrome) et bloquées de la page courante (profil de scraping)"""
+        if not self.config.scrape_profile:
+            return
+        try:
+            request_types = {}
+            for entry in self.driver.get_log('performance'):
+                message = json.loads(entry['message'])['message']
+                method, params = message.get('method'), message.get('params', {})
+                if method in ('Network.requestWillBeSent', 'Network.responseReceived') and params.get('type'):
+                    request_types[params['requestId']] = params['type']
+                elif method == 'Network.loadingFinished':
+                    # encodedDataLength : octets réellement reçus (en-têtes compris), y compris hors domaine
+                    loaded = self.loaded_by_type.setdefault(request_types.get(params['requestId'], 'Other'), [0, 0])
+                    loaded[0] += int(params.get('encodedDataLength', 0))
+                    loaded[1] += 1
+                    self.network_stats['requests'] += 1
+                    self.network_stats['transferred_bytes'] += int(params.get('encodedDataLength', 0))
+                elif method == 'Network.loadingFailed' and params.get('blockedReason'):
+                    resource_type = params.get('type') or request_types.get(params['requestId'], 'Other')
+                    self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + 1
+                    self.network_stats['blocked'] += 1
+        except Exception as e:
+            logger.info(f"DEBUG: Statistiques réseau indisponibles : {e}")
+    
+    def _estimated_saved_bytes(self) -> int:
+        """Octets évités : chaque requête bloquée compte pour la taille moyenne reçue de son type de ressource"""
+        total_bytes = sum(loaded[0] for loaded in self.loaded_by_type.values())
+        total_requests = sum(loaded[1] for loaded in self.loaded_by_type.values())
+        overall = total_bytes / total_requests if total_requests else 0
+        saved = 0.0
+        for resource_type, blocked in self.blocked_by_type.items():
+            loaded_bytes, loaded_requests = self.loaded_by_type.get(resource_type, [0, 0])
+            saved += blocked * (loaded_bytes / loaded_requests if loaded_requests else overall)
+        return int(saved)
     
     def close(self):
         """Ferme le driver"""
         if self.driver:
+            if self.config.scrape_profile and self.network_stats['requests']:
+                stats = self.network_stats
+                stats['saved_bytes'] = self._estimated_saved_bytes()
+                logger.info(f"📉 Profil de scraping : {stats['blocked']} requête(s) bloquée(s) "
+                            f"(~{stats['saved_bytes']/1024:.0f} KB évités, estimation), "
+                            f"{stats['requests']} chargée(s), {stats['transferred_bytes']/1024:.0f} KB reçus")
+                report.set('scrape_profile', dict(stats))
             self.driver.quit()
             logger.info("Driver fermé")
 
 class FacebookPublisher:
     """Classe pour publier sur Facebook"""
     
+    # Nombre maximal d'opérations par requête batch de l'API Graph
+    MAX_BATCH_SIZE = 50
+    
     def __init__(self, config: FacebookConfig):
+        import requests
+        from requests.adapters import HTTPAdapter
+        
         self.config = config
+        # Session partagée : connexions TLS réutilisées entre les appels Graph
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(4, config.upload_concurrency))
+        self.session.mount('https://', adapter)
+        self.card_renderer = None
     
-    def publish_matches(self, matches: List[Match], test_date: datetime) -> bool:
-        """Publie les matchs sur Facebook"""
+    @report.timed()
+    def publish_matches(self, matches: List[Match], test_date: datetime, media: Optional['SponsorMediaPipeline'] = None) -> bool:
+        """Publie les matchs sur Facebook (reprise à la première étape incomplète selon le registre)
+
+        media : images déjà préparées en parallèle de l'extraction, rejointes ici (sinon préparées maintenant).
+        """
+        from publish_ledger import PublishLedger, schedule_hash
+        
+        ledger = None
         try:
+            ledger = PublishLedger(self.config.ledger_file)
+            entry = ledger.get(self.config.page_id, test_date.date(), schedule_hash(matches))
+            if entry.published:
+                logger.info(f"Horaire identique déjà publié pour le {entry.day} (post {entry.post_id}) - aucune nouvelle publication")
+                report.set('skipped', 'horaire déjà publié')
+                report.set('post_id', entry.post_id)
+                return True
+            previous = ledger.latest_post(self.config.page_id, test_date.date())
+            if previous:
+                logger.info(f"Horaire modifié depuis la publication {previous.post_id} - nouvelle publication")
+            
             # Construire le message
             message = self._build_message(matches, test_date)
             
@@ -497,65 +883,314 @@ class FacebookPublisher:
             logger.info(message)
             logger.info("=" * 50)
             
-            # Publier le message texte avec form-data (plus compatible avec les émojis)
-            feed_data = {
-                'message': message.encode('utf-8').decode('utf-8'),
-                'access_token': self.config.access_token,
-                'published': 'true'
-            }
-            
-            response = requests.post(
-                self.config.feed_api_url,
-                data=feed_data
-            )
-            
-            # Debug: afficher la réponse en cas d'erreur
-            if response.status_code != 200:
-                logger.error(f"Réponse Facebook: {response.status_code} - {response.text}")
+            card = self._schedule_card(matches, test_date) if self.config.schedule_card else None
             
-            response.raise_for_status()
+            if entry.media_fbids is not None:
+                # Images déjà envoyées par une exécution interrompue : seul le post reste à créer
+                logger.info(f"📒 Reprise : {len(entry.media_fbids)} image(s) déjà envoyée(s), création du post")
+                with run_deadline.stage('publish'):
+                    post_id = self._publish_feed(message, entry.attached_media)
+            elif media is not None and (attached_media := self._join_media(media)) is not None:
+                # Images envoyées pendant l'extraction : seul le post reste à créer (carte de l'horaire en premier)
+                if card:
+                    attached_media = self._upload_sponsor_images([card]) + attached_media
+                ledger.record_media(entry, attached_media)
+                with run_deadline.stage('publish'):
+                    post_id = self._publish_feed(message, attached_media)
+            else:
+                # Préparer les images avant la publication : le post est mis en ligne avec ses images,
+                # ou en texte seul si l'échéance de l'exécution approche
+                images = []
+                with run_deadline.stage('images'):
+                    if media is not None:
+                        logger.warning("Images préparées en parallèle indisponibles - publication du texte seul")
+                        report.set('degraded', 'images')
+                    elif run_deadline.allows(self.config.images_min_seconds):
+                        images = self._prepare_sponsor_images()
+                    else:
+                        logger.warning("⏳ Temps insuffisant pour les images - publication du texte seul")
+                        report.set('degraded', 'images')
+                
+                if card:
+                    images = [card] + images
+                
+                with run_deadline.stage('publish'):
+                    if images:
+                        post_id = self._publish_with_images(message, images, partial(ledger.record_media, entry))
+                    else:
+                        post_id = self._publish_feed(message)
             
-            post_data = response.json()
-            post_id = post_data['id']
+            ledger.record_post(entry, post_id, len(entry.media_fbids or []))
+            report.set('post_id', post_id)
+            report.set('images_attached', entry.images_attached)
             logger.info(f"✅ Publication Facebook réussie. Post ID : {post_id}")
-            
-            # Attacher les images si disponibles
-            self._attach_sponsor_images(post_id)
-            
             logger.info("✅ Publication complète réussie !")
             return True
             
         except Exception as e:
             logger.error(f"Erreur lors de la publication Facebook : {e}")
             return False
+        finally:
+            if ledger:
+                ledger.close()
+    
+    def _schedule_card(self, matches: List[Match], test_date: datetime) -> Optional[SponsorImage]:
+        """Carte image de l'horaire (gabarit rendu une seule fois par publieur) ; None si le rendu échoue"""
+        try:
+            start = time.perf_counter()
+            card = self._card_renderer().sponsor_image(test_date.date(), matches)
+            logger.info(f"⏱️ Carte de l'horaire ({len(card.data)/1024:.0f} KB) : {time.perf_counter() - start:.2f}s")
+            return card
+        except Exception as e:
+            logger.warning(f"Carte de l'horaire non rendue : {e}")
+            return None
+    
+    def _card_renderer(self):
+        if self.card_renderer is None:
+            from schedule_card import CardStyle, ScheduleCardRenderer, hex_color
+            style = CardStyle(
+                title=self.config.card_title,
+                background=hex_color(self.config.card_background),
+                accent=hex_color(self.config.card_accent),
+                font_path=self.config.card_font,
+                bold_font_path=self.config.card_bold_font
+            )
+            self.card_renderer = ScheduleCardRenderer(style, self.config.sponsor_folder, self.config.card_cache_dir)
+        return self.card_renderer
+    
+    def _join_media(self, media: 'SponsorMediaPipeline') -> Optional[List[Dict]]:
+        """Attend les images préparées en parallèle, au plus le temps de l'étape images"""
+        with run_deadline.stage('images'):
+            with report.span('media_join'):
+                return media.take(timeout=run_deadline.stage_remaining())
+    
+    @report.timed('graph_feed')
+    def _publish_feed(self, message: str, attached_media: Optional[List[Dict]] = None) -> str:
+        """Publie le message (avec images déjà envoyées, si fournies) et retourne l'ID du post"""
+        # Publier le message texte avec form-data (plus compatible avec les émojis)
+        feed_data = {
+            'message': message,
+            'access_token': self.config.access_token,
+            'published': 'true'
+        }
+        for index, media in enumerate(attached_media or []):
+            feed_data[f'attached_media[{index}]'] = json.dumps(media)
+        
+        response = self._post(self.config.feed_api_url, 'graph_feed', data=feed_data)
+        return response.json()['id']
+    
+    def _post(self, url: str, description: str, **kwargs):
+        """POST vers l'API Graph, relancé seulement si Facebook ne l'a pas reçu (connexion impossible, 429)"""
+        def attempt():
+            response = self.session.post(url, timeout=self.config.graph_timeout, **kwargs)
+            # Debug: afficher la réponse en cas d'erreur
+            if response.status_code != 200:
+                logger.error(f"Réponse Facebook ({description}): {response.status_code} - {response.text}")
+            response.raise_for_status()
+            return response
+        return self.config.retry_policy.call(attempt, description=description)
+    
+    def _publish_with_images(self, message: str, images: List[SponsorImage], record_media) -> str:
+        """Envoie les images et le post en une requête batch ; repli sur des appels séparés en cas d'échec
+
+        record_media reçoit les images envoyées (attached_media) avant la création du post.
+        """
+        import requests
+        
+        images = images[:self.MAX_BATCH_SIZE - 1]
+        try:
+            results = self._send_batch(message, images)
+        except requests.RequestException as e:
+            if not failed_before_send(e):
+                # Le batch a peut-être créé le post : le renvoyer risquerait un doublon (reprise via le registre)
+                logger.error(f"Requête batch échouée après envoi ({e}) - aucun nouvel essai")
+                raise
+            report.count('retries')
+            if not run_deadline.allows(self.config.images_min_seconds):
+                logger.warning(f"Requête batch échouée ({e}) - temps insuffisant, publication du texte seul")
+                report.set('degraded', 'images')
+                return self._publish_feed(message)
+            logger.warning(f"Requête batch échouée ({e}) - envoi séparé des images")
+            attached_media = self._upload_sponsor_images(images)
+            record_media(attached_media)
+            return self._publish_feed(message, attached_media)
+        
+        # Résultats par opération : images puis post
+        attached_media = []
+        for image, result in zip(images, results):
+            body = self._batch_body(result)
+            if result and result.get('code') == 200 and 'id' in body:
+                attached_media.append({'media_fbid': body['id']})
+            else:
+                logger.warning(f"Erreur lors de l'upload de {image.filename}: {self._batch_error(result, body)}")
+        record_media(attached_media)
+        
+        feed_result = results[len(images)] if len(results) > len(images) else None
+        feed_body = self._batch_body(feed_result)
+        if feed_result and feed_result.get('code') == 200 and 'id' in feed_body:
+            logger.info(f"✅ {len(attached_media)} images attachées avec succès")
+            return feed_body['id']
+        
+        # Le post dépend de toutes les images : le republier avec celles qui ont réussi
+        logger.warning(f"Post non créé par le batch : {self._batch_error(feed_result, feed_body)}")
+        report.count('retries')
+        post_id = self._publish_feed(message, attached_media)
+        if attached_media:
+            logger.info(f"✅ {len(attached_media)} images attachées avec succès")
+        return post_id
+    
+    @report.timed('graph_batch')
+    def _send_batch(self, message: str, images: List[SponsorImage]) -> List[Optional[Dict]]:
+        """Envoie les images non publiées et le post (qui les référence) dans une seule requête batch"""
+        batch = []
+        files = {}
+        for index, image in enumerate(images):
+            files[f'file{index}'] = (image.filename, image.data, image.mime_type)
+            batch.append({
+                'method': 'POST',
+                'relative_url': f"{self.config.page_id}/photos",
+                'body': 'published=false',
+                'attached_files': f'file{index}',
+                'name': f'photo{index}',
+                'omit_response_on_success': False
+            })
+        
+        feed_body = urlencode({'message': message, 'published': 'true'})
+        for index in range(len(images)):
+            feed_body += f'&attached_media[{index}]={{"media_fbid":"{{result=photo{index}:$.id}}"}}'
+        batch.append({
+            'method': 'POST',
+            'relative_url': f"{self.config.page_id}/feed",
+            'body': feed_body
+        })
+        
+        start = time.perf_counter()
+        response = self._post(
+            self.config.graph_api_url,
+            'graph_batch',
+            data={'access_token': self.config.access_token, 'batch': json.dumps(batch)},
+            files=files
+        )
+        report.count('bytes_uploaded', sum(len(image.data) for image in images))
+        logger.info(f"⏱️ Requête batch ({len(batch)} opérations) : {time.perf_counter() - start:.2f}s")
+        return response.json()
+    
+    @staticmethod
+    def _batch_body(result: Optional[Dict]) -> Dict:
+        try:
+            return json.loads(result['body']) if result and result.get('body') else {}
+        except ValueError:
+            return {}
+    
+    @staticmethod
+    def _batch_error(result: Optional[Dict], body: Dict) -> str:
+        if not result:
+            return "aucune réponse (dépendance échouée)"
+        error = body.get('error', {})
+        return f"{result.get('code')} - {error.get('message', body)}"
     
     def _build_message(self, matches: List[Match], test_date: datetime) -> str:
         """Construit le message Facebook"""
         current_date = test_date.strftime("%Y-%m-%d")
-        intro_message = "Venez encourager nos Titans ! Voici les matchs de la journée sur nos terrains:\n\n"
+        intro_message = f"{self.config.intro_message}\n\n"
         table_header = f"⚾ Matchs de la journée ({current_date}) ⚾\n\n"
         table_content = ""
         
         for match in matches:
-            venue = re.sub(r" - Baseball.*$", "", match.venue)
+            venue = canonical_venue(match.venue)
             table_content += f"⏰ {match.time}  {match.home_team}  vs  {match.away_team}  🏟️ {venue}\n"
         
         automated_message = "*** Ceci est un message automatisé, toujours valider l'horaire sur: https://page.spordle.com/fr/ligue-de-baseball-mineur-de-la-region-de-quebec/schedule-stats-standings ***"
         
         return f"{intro_message}{table_header}{table_content}\n{automated_message}\n\nMerci à nos commanditaires !"
     
-    def _attach_sponsor_images(self, post_id: str):
-        """Attache les images des commanditaires"""
+    def _image_cache(self) -> SponsorImageCache:
+        return SponsorImageCache(
+            self.config.sponsor_cache_dir,
+            self.config.sponsor_cache_max_bytes,
+            self.config.image_budget,
+            self.config.image_formats
+        )
+    
+    @report.timed()
+    def _render_sponsor_images(self, image_files: List[Path]) -> List[SponsorImage]:
+        """Redimensionne les images dans un pool de processus et les retourne dans l'ordre d'origine"""
+        workers = max(1, min(self.config.render_workers, len(image_files)))
+        image_cache = self._image_cache()
+        render = partial(_render_sponsor_image, image_cache)
+        sources = [str(f) for f in image_files]
+        
+        start = time.perf_counter()
+        if workers == 1:
+            results = list(map(render, sources))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(render, sources))
+        
+        for source, (image, elapsed) in zip(sources, results):
+            # Rendu chronométré dans le processus de travail, reporté ici
+            report.record('render_image', elapsed, 'ok' if image else 'failed', '_render_sponsor_images', image=Path(source).name)
+            logger.info(f"⏱️ Rendu {Path(source).name} : {elapsed:.2f}s{'' if image else ' (échec)'}")
+        logger.info(f"⏱️ Rendu de {len(sources)} image(s) avec {workers} processus : {time.perf_counter() - start:.2f}s")
+        
+        # Évincer une seule fois après le rendu parallèle, sans toucher aux images de cette exécution
+        rendered = [image for image, _ in results if image]
+        image_cache.evict(keep=[Path(image.cache_path) for image in rendered if image.cache_path])
+        return rendered
+    
+    @report.timed('graph_photo')
+    def _upload_photo(self, image: SponsorImage) -> Optional[str]:
+        """Envoie une image non publiée (directement depuis la mémoire) et retourne son identifiant"""
+        start = time.perf_counter()
         try:
-            # Créer le dossier temporaire
-            temp_folder = Path("temp")
-            temp_folder.mkdir(exist_ok=True)
+            files = {'source': (image.filename, image.data, image.mime_type)}
+            data = {
+                'access_token': self.config.access_token,
+                'published': 'false'
+            }
+            
+            response = self._post(self.config.photo_api_url, 'graph_photo', files=files, data=data)
+            
+            photo_id = response.json()['id']
+            report.count('bytes_uploaded', len(image.data))
+            logger.info(f"⏱️ Upload {image.filename} ({len(image.data)/1024:.1f} KB) : {time.perf_counter() - start:.2f}s")
+            return photo_id
             
+        except Exception as e:
+            logger.warning(f"Erreur lors de l'upload de {image.filename}: {e}")
+            return None
+    
+    def _delete_photos(self, attached_media: List[Dict]):
+        """Supprime des photos non publiées qui ne seront rattachées à aucun post"""
+        for media in attached_media:
+            try:
+                response = self.session.delete(
+                    f"{self.config.graph_api_url}{media['media_fbid']}",
+                    params={'access_token': self.config.access_token},
+                    timeout=self.config.graph_timeout
+                )
+                response.raise_for_status()
+            except Exception as e:
+                logger.warning(f"Suppression de la photo {media['media_fbid']} échouée : {e}")
+    
+    def _upload_sponsor_images(self, images: List[SponsorImage]) -> List[Dict]:
+        """Envoie les images dans un pool de threads borné et retourne attached_media dans l'ordre d'origine"""
+        workers = max(1, min(self.config.upload_concurrency, len(images)))
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            photo_ids = list(pool.map(self._upload_photo, images))
+        logger.info(f"⏱️ Upload de {len(images)} image(s) avec {workers} threads : {time.perf_counter() - start:.2f}s")
+        return [{'media_fbid': photo_id} for photo_id in photo_ids if photo_id]
+    
+    @report.timed()
+    def _prepare_sponsor_images(self) -> List[SponsorImage]:
+        """Retourne les images des commanditaires encodées en mémoire (liste vide si aucune)"""
+        try:
             # Récupérer les images des commanditaires
-            sponsor_folder = Path("Commanditaire")
+            sponsor_folder = Path(self.config.sponsor_folder)
             if not sponsor_folder.exists():
-                logger.warning("Dossier 'commanditaire' non trouvé")
-                return
+                logger.warning(f"Dossier '{sponsor_folder}' non trouvé")
+                return []
             
             image_files = [f for f in sponsor_folder.iterdir() 
                           if f.is_file() and f.suffix.lower() in ['.jpg', '.jpeg', '.png']]
@@ -563,95 +1198,171 @@ class FacebookPublisher:
             logger.info(f"Fichiers de commanditaires trouvés : {len(image_files)}")
             
             if not image_files:
-                return
-            
-            # Redimensionner les images
-            resized_image_paths = []
-            for image_file in image_files:
-                temp_image_path = temp_folder / f"resized_{image_file.stem}.png"
-                success = ImageProcessor.resize_image(
-                    str(image_file), 
-                    str(temp_image_path), 
-                    target_size=1200, 
-                    target_aspect_ratio=1.0
-                )
-                if success:
-                    resized_image_paths.append(str(temp_image_path))
-            
-            if not resized_image_paths:
-                return
+                return []
             
-            # Publier les images et les attacher
-            attached_media = []
-            for image_path in resized_image_paths:
-                try:
-                    with open(image_path, 'rb') as img_file:
-                        files = {'source': img_file}
-                        data = {
-                            'access_token': self.config.access_token,
-                            'published': 'false'
-                        }
-                        
-                        response = requests.post(self.config.photo_api_url, files=files, data=data)
-                        response.raise_for_status()
-                        
-                        photo_data = response.json()
-                        attached_media.append({'media_fbid': photo_data['id']})
-                        
-                except Exception as e:
-                    logger.warning(f"Erreur lors de l'upload de {image_path}: {e}")
-            
-            # Attacher les images au post
-            if attached_media:
-                update_url = f"https://graph.facebook.com/v22.0/{post_id}"
-                update_data = {
-                    'attached_media': attached_media,
-                    'access_token': self.config.access_token
-                }
-                
-                response = requests.post(update_url, json=update_data)
-                response.raise_for_status()
-                
-                logger.info(f"✅ {len(attached_media)} images attachées avec succès")
-            
-            # Nettoyer les fichiers temporaires
-            for image_path in resized_image_paths:
-                try:
-                    os.remove(image_path)
-                except:
-                    pass
+            # Redimensionner les images (en parallèle, cache réutilisé si la source n'a pas changé)
+            return self._render_sponsor_images(image_files)
                     
         except Exception as e:
-            logger.error(f"Erreur lors de l'attachement des images : {e}")
+            logger.error(f"Erreur lors de la préparation des images : {e}")
+            return []
+
+def _render_sponsor_image(image_cache: SponsorImageCache, source_path: str) -> Tuple[Optional[SponsorImage], float]:
+    """Rend une image de commanditaire (exécuté dans un processus du pool)"""
+    start = time.perf_counter()
+    image = image_cache.get_or_render(source_path, target_size=1200, target_aspect_ratio=1.0, evict=False)
+    return image, time.perf_counter() - start
+
+def run_extraction(extractor, test_date: datetime) -> Optional[List[Match]]:
+    """Démarre l'extracteur, se connecte et récupère les matchs (None si démarrage ou connexion échoue)"""
+    try:
+        if not extractor.start_driver():
+            logger.error("Impossible de démarrer le driver")
+            return None
+        
+        if not extractor.login():
+            logger.error("Connexion à Spordle échouée")
+            return None
+        
+        return extractor.get_matches(test_date)
+    finally:
+        extractor.close()
+
+def fetch_matches(config: SpordleConfig, test_date: datetime) -> Optional[List[Match]]:
+    """Récupère les matchs via l'API JSON, avec Chrome conservé en repli (ou depuis l'horaire Excel)"""
+    if config.fetch_mode == 'excel':
+        from excel_schedule import ExcelScheduleExtractor
+        return run_extraction(ExcelScheduleExtractor(config), test_date)
+    
+    if config.fetch_mode in ('auto', 'api'):
+        import requests
+        from spordle_api import SpordleApiExtractor, SpordleApiError
+        try:
+            matches = run_extraction(SpordleApiExtractor(config), test_date)
+            if matches is not None:
+                logger.info("Matchs récupérés via l'API Spordle (sans navigateur)")
+                return matches
+        except (SpordleApiError, requests.RequestException, ValueError) as e:
+            logger.warning(f"Échec du mode API Spordle : {e}")
+        
+        if config.fetch_mode == 'api':
+            return None
+        if not run_deadline.allows(config.browser_min_seconds):
+            logger.warning("⏳ Temps insuffisant pour l'extraction via Chrome - repli sur le cache")
+            report.set('degraded', 'browser')
+            return None
+        logger.info("Repli sur l'extraction via Chrome")
+    
+    return run_extraction(SpordleScheduleExtractor(config), test_date)
+
+def reconcile_with_cache(config: SpordleConfig, test_date: datetime, matches: Optional[List[Match]]) -> Optional[List[Match]]:
+    """Mémorise l'horaire récupéré, ou retourne celui du cache si l'extraction a échoué"""
+    from schedule_cache import ScheduleCache
+    cache = ScheduleCache(config.schedule_cache_file)
+    try:
+        if matches is None:
+            matches = cache.get_matches(test_date.date())
+            if matches is not None:
+                logger.warning(f"Spordle indisponible - publication à partir du cache ({len(matches)} match(s))")
+        else:
+            # Journée sans match comprise : une extraction réussie fait foi
+            cache.update_day(test_date.date(), matches).log()
+        return matches
+    finally:
+        cache.close()
+
+def nothing_to_do(config: SpordleConfig, test_date: datetime) -> Optional[str]:
+    """Vérifications peu coûteuses (calendrier, cache local) : raison de ne rien faire, None s'il faut extraire"""
+    if config.season_window:
+        season_start, season_end = config.season_window.split(':')
+        day = test_date.strftime('%m-%d')
+        if season_start <= season_end:
+            in_season = season_start <= day <= season_end
+        else:
+            in_season = day >= season_start or day <= season_end
+        if not in_season:
+            return f"hors saison ({config.season_window})"
+    
+    if Path(config.schedule_cache_file).exists():
+        from schedule_cache import ScheduleCache
+        cache = ScheduleCache(config.schedule_cache_file)
+        try:
+            refreshed = cache.refreshed_at(test_date.date())
+            fresh = refreshed is not None and time.time() - refreshed < config.schedule_cache_max_age * 3600
+            if fresh and cache.get_matches(test_date.date()) == []:
+                age = (time.time() - refreshed) / 3600
+                return f"aucun match au cache de l'horaire (rafraîchi il y a {age:.1f} h)"
+        finally:
+            cache.close()
+    return None
+
+def open_extractor(config: SpordleConfig):
+    """Premier extracteur démarré et connecté (API, Excel ou Chrome selon fetch_mode), None si aucun"""
+    candidates = []
+    if config.fetch_mode == 'excel':
+        from excel_schedule import ExcelScheduleExtractor
+        candidates.append(ExcelScheduleExtractor)
+    else:
+        if config.fetch_mode in ('auto', 'api'):
+            from spordle_api import SpordleApiExtractor
+            candidates.append(SpordleApiExtractor)
+        if config.fetch_mode != 'api':
+            candidates.append(SpordleScheduleExtractor)
+    
+    for extractor_class in candidates:
+        extractor = extractor_class(config)
+        if extractor.start_driver() and extractor.login():
+            return extractor
+        extractor.close()
+    return None
+
+def get_test_date() -> datetime:
+    """Date traitée : aujourd'hui, décalée par DATE_OFFSET (pour GitHub Actions)"""
+    date_offset = int(os.getenv('DATE_OFFSET', '0'))
+    test_date = datetime.now() + timedelta(days=date_offset)
+    if date_offset != 0:
+        logger.info(f"Mode test: Date décalée de {date_offset} jour(s) - {test_date.strftime('%Y-%m-%d')}")
+    return test_date
 
 def main():
     """Fonction principale"""
     try:
-        # Configuration
-        spordle_config = SpordleConfig()
-        facebook_config = FacebookConfig()
+        test_date = get_test_date()
         
-        # Configuration de la date via variable d'environnement (pour GitHub Actions)
-        date_offset = int(os.getenv('DATE_OFFSET', '0'))
-        test_date = datetime.now() + timedelta(days=date_offset)
+        # Mode multi-clubs : un fichier de configuration liste les bureaux et leurs pages Facebook
+        clubs_file = os.getenv('SPORDLE_CLUBS_FILE')
+        if clubs_file:
+            from multi_club import run_clubs
+            return run_clubs(clubs_file, test_date)
         
-        if date_offset != 0:
-            logger.info(f"Mode test: Date décalée de {date_offset} jour(s) - {test_date.strftime('%Y-%m-%d')}")
+        # Rien à faire (hors saison, journée vide au cache) : aucun navigateur ni module lourd chargé
+        spordle_config = SpordleConfig()
+        reason = nothing_to_do(spordle_config, test_date)
+        if reason:
+            logger.info(f"Aucune publication nécessaire : {reason}")
+            report.set('skipped', reason)
+            return True
+        # Horaire déjà publié : vérifié par le registre après une extraction fraîche (publish_matches),
+        # pour qu'une relance après un changement d'horaire publie la correction
+        facebook_config = FacebookConfig()
         
-        # Extraction des matchs
-        extractor = SpordleScheduleExtractor(spordle_config)
+        # Images des commanditaires rendues et envoyées (non publiées) pendant l'extraction
+        publisher = FacebookPublisher(facebook_config)
+        media = None
+        if facebook_config.media_pipeline:
+            from media_pipeline import SponsorMediaPipeline
+            media = SponsorMediaPipeline(publisher).start()
         
         try:
-            if not extractor.start_driver():
-                logger.error("Impossible de démarrer le driver")
-                return False
+            # Extraction des matchs (API JSON si possible, Chrome en repli), bornée par sa part de l'échéance
+            with run_deadline.stage('extract'):
+                matches = fetch_matches(spordle_config, test_date)
             
-            if not extractor.login():
-                logger.error("Connexion à Spordle échouée")
+            # Cache local : mémoriser l'horaire validé, ou s'en servir si Spordle est indisponible
+            matches = reconcile_with_cache(spordle_config, test_date, matches)
+            if matches is None:
                 return False
-            
-            # Récupérer les matchs
-            matches = extractor.get_matches(test_date)
+            report.set('matches', len(matches))
             
             # Vérification cruciale
             if not matches:
@@ -676,16 +1387,184 @@ def main():
             logger.info(f"✅ {len(matches)} match(s) trouvé(s) pour aujourd'hui")
             
             # Publication sur Facebook
-            publisher = FacebookPublisher(facebook_config)
-            return publisher.publish_matches(matches, test_date)
-            
+            return publisher.publish_matches(matches, test_date, media)
         finally:
-            extractor.close()
+            # Envois inutilisés (aucun match, extraction échouée) supprimés
+            if media:
+                media.close()
             
     except Exception as e:
         logger.error(f"Erreur dans la fonction principale : {e}")
         return False
 
+def extract_schedule(days: int) -> bool:
+    """Sous-commande extract : récupère l'horaire (et les N jours suivants) et met à jour le cache"""
+    config = SpordleConfig()
+    test_date = get_test_date()
+    if days <= 0:
+        fetched = fetch_matches(config, test_date)
+        matches = reconcile_with_cache(config, test_date, fetched)
+        if matches is None:
+            return False
+        for match in matches:
+            logger.info(f"⏰ {match.time}  {match.home_team}  vs  {match.away_team}  🏟️ {match.venue}")
+        logger.info(f"{len(matches)} match(s) le {test_date.strftime('%Y-%m-%d')}")
+        report.set('matches', len(matches))
+        if fetched is None:
+            # Horaire affiché depuis le cache : l'extraction elle-même a échoué
+            logger.warning("⚠️ Extraction échouée - horaire du cache affiché, possiblement périmé")
+            report.set('degraded', 'cache')
+            return False
+        return True
+    
+    from schedule_cache import ScheduleCache
+    extractor = open_extractor(config)
+    if extractor is None:
+        logger.error("Aucune source d'horaire disponible")
+        return False
+    cache = ScheduleCache(config.schedule_cache_file)
+    try:
+        cache.refresh(extractor, test_date.date(), days, max_age_hours=0)
+        return True
+    except Exception as e:
+        logger.error(f"Rafraîchissement du cache échoué : {e}")
+        return False
+    finally:
+        cache.close()
+        extractor.close()
+
+def publish_cached_schedule() -> bool:
+    """Sous-commande publish : publie l'horaire du cache local, sans extraction"""
+    from schedule_cache import ScheduleCache
+    test_date = get_test_date()
+    cache = ScheduleCache(SpordleConfig(require_password=False).schedule_cache_file)
+    try:
+        matches = cache.get_matches(test_date.date())
+    finally:
+        cache.close()
+    
+    if matches is None:
+        logger.error(f"Aucun horaire en cache pour le {test_date.strftime('%Y-%m-%d')} - lancer d'abord 'extract'")
+        return False
+    report.set('matches', len(matches))
+    if not matches:
+        logger.info(f"Aucun match le {test_date.strftime('%Y-%m-%d')} - aucune publication")
+        return True
+    return FacebookPublisher(FacebookConfig()).publish_matches(matches, test_date)
+
+def render_images() -> bool:
+    """Sous-commande render-images : prépare les images des commanditaires dans le cache (sans Facebook)"""
+    publisher = FacebookPublisher(FacebookConfig(require_credentials=False))
+    images = publisher._prepare_sponsor_images()
+    total = sum(len(image.data) for image in images)
+    logger.info(f"{len(images)} image(s) prête(s) : {total/1024:.0f} KB")
+    return True
+
+def render_cards(days: int) -> bool:
+    """Sous-commande render-cards : cartes de l'horaire en cache (aujourd'hui et les N jours suivants) dans temp/cards"""
+    from schedule_cache import ScheduleCache
+    test_date = get_test_date()
+    cache = ScheduleCache(SpordleConfig(require_password=False).schedule_cache_file)
+    try:
+        matches_by_date = {}
+        for offset in range(days + 1):
+            day = test_date.date() + timedelta(days=offset)
+            matches_by_date[day] = cache.get_matches(day) or []
+    finally:
+        cache.close()
+    
+    publisher = FacebookPublisher(FacebookConfig(require_credentials=False))
+    renderer = publisher._card_renderer()
+    start = time.perf_counter()
+    cards = renderer.render_week(matches_by_date)
+    output = Path('temp/cards')
+    output.mkdir(parents=True, exist_ok=True)
+    for day, card in cards.items():
+        (output / f"horaire_{day.isoformat()}.jpg").write_bytes(renderer.encode(card))
+    logger.info(f"{len(cards)} carte(s) rendue(s) dans {output} en {time.perf_counter() - start:.2f}s")
+    return True
+
+def measure_import_time(top: int = 10) -> float:
+    """Importe ce module dans un nouvel interpréteur (python -X importtime) et affiche les modules les plus lents"""
+    import subprocess
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {Path(__file__).stem}'],
+        cwd=Path(__file__).parent, capture_output=True, text=True
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        parts = line.split('|')
+        if len(parts) == 3 and parts[0].startswith('import time:') and parts[1].strip().isdigit():
+            modules.append((int(parts[1]), parts[2].rstrip()))
+    if not modules:
+        logger.error(f"Mesure d'importation impossible : {result.stderr[-500:]}")
+        return 0.0
+    
+    total = sum(self_us for self_us, _ in modules) / 1e6
+    logger.info(f"⏱️ Importation à froid : {total * 1000:.0f} ms ({len(modules)} modules)")
+    for self_us, name in sorted(modules, reverse=True)[:top]:
+        logger.info(f"   {self_us / 1000:7.1f} ms {name}")
+    report.set('cold_import_seconds', round(total, 4))
+    return total
+
+# Codes de sortie : un planificateur distingue « rien à faire » d'une erreur
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_NOTHING_TO_DO = 3
+
+def check(imports: bool = False) -> int:
+    """Sous-commande check : EXIT_OK s'il faut extraire et publier aujourd'hui, EXIT_NOTHING_TO_DO sinon"""
+    if imports:
+        measure_import_time()
+    reason = nothing_to_do(SpordleConfig(require_password=False), get_test_date())
+    if reason:
+        logger.info(f"Rien à faire : {reason}")
+        return EXIT_NOTHING_TO_DO
+    logger.info("Extraction requise")
+    return EXIT_OK
+
+def cli(argv: List[str]) -> int:
+    """Point d'entrée : sans sous-commande, exécution complète (extraction puis publication)"""
+    import argparse
+    parser = argparse.ArgumentParser(description="Publication de l'horaire Spordle sur Facebook")
+    commands = parser.add_subparsers(dest='command')
+    extract_parser = commands.add_parser('extract', help="récupère l'horaire et met à jour le cache local")
+    extract_parser.add_argument('--days', type=int, default=0, help="rafraîchit aussi les N jours suivants")
+    commands.add_parser('publish', help="publie l'horaire en cache, sans extraction")
+    commands.add_parser('render-images', help="prépare les images des commanditaires dans le cache")
+    cards_parser = commands.add_parser('render-cards', help="rend les cartes de l'horaire en cache dans temp/cards")
+    cards_parser.add_argument('--days', type=int, default=6, help="jours suivants à rendre en plus d'aujourd'hui")
+    check_parser = commands.add_parser('check', help="code 0 s'il y a quelque chose à publier, 3 s'il n'y a rien à faire, 1 en cas d'erreur")
+    check_parser.add_argument('--imports', action='store_true', help="mesure le temps d'importation à froid")
+    args = parser.parse_args(argv)
+    
+    # Échéance globale, sous le timeout du workflow (30 minutes) : chaque étape en reçoit une part
+    deadline_minutes = float(os.getenv('RUN_DEADLINE_MINUTES', '25'))
+    run_deadline.reset(deadline_minutes * 60 if deadline_minutes > 0 else None)
+    
+    try:
+        if args.command == 'check':
+            return check(args.imports)
+        if args.command == 'extract':
+            success = extract_schedule(args.days)
+        elif args.command == 'publish':
+            success = publish_cached_schedule()
+        elif args.command == 'render-images':
+            success = render_images()
+        elif args.command == 'render-cards':
+            success = render_cards(args.days)
+        else:
+            success = main()
+    except Exception as e:
+        logger.error(f"Erreur dans la commande {args.command} : {e}")
+        return EXIT_ERROR
+    return EXIT_OK if success else EXIT_ERROR
+
 if __name__ == "__main__":
-    success = main()
-    sys.exit(0 if success else 1)
+    # multi_club et driver_pool importent le publieur et l'extracteur : réutiliser ce module plutôt que de le recharger
+    sys.modules.setdefault('spordle_facebook', sys.modules[__name__])
+    report.set('import_seconds', round(IMPORT_SECONDS, 4))
+    exit_code = cli(sys.argv[1:])
+    report.set('success', exit_code != EXIT_ERROR)
+    report.write(os.getenv('RUN_REPORT_FILE', 'temp/run_report.json'))
+    sys.exit(exit_code)
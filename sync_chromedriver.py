@@ -1,18 +1,31 @@
 #!/usr/bin/env python3
 """
-Script pour forcer la synchronisation ChromeDriver avec la version exacte de Chrome
+Script pour synchroniser ChromeDriver avec la version exacte de Chrome (cache versionné, téléchargement seulement si nécessaire)
 """
 
 import subprocess
 import re
 import os
+import io
 import shutil
 import sys
 import logging
+import zipfile
+
+import requests
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Cache des ChromeDriver, un dossier par version de Chrome
+DRIVER_CACHE_DIR = os.getenv('CHROMEDRIVER_CACHE_DIR', os.path.expanduser('~/.cache/spordle_chromedriver'))
+DRIVER_BINARY = 'chromedriver.exe' if sys.platform.startswith('win') else 'chromedriver'
+
+# Chrome for Testing : distribution officielle de ChromeDriver
+CFT_DOWNLOAD_URL = "https://storage.googleapis.com/chrome-for-testing-public"
+CFT_BUILDS_URL = "https://googlechromelabs.github.io/chrome-for-testing/latest-patch-versions-per-build-with-downloads.json"
+CFT_PLATFORM = 'win64' if sys.platform.startswith('win') else ('mac-x64' if sys.platform == 'darwin' else 'linux64')
+
 def get_chrome_version():
     """Récupère la version exacte de Chrome installée"""
     try:
@@ -54,7 +67,7 @@ def force_chrome_binary_path():
     return None
 
 def clear_all_chrome_caches():
-    """Nettoie tous les caches liés à Chrome et ChromeDriver"""
+    """Nettoie tous les caches liés à Chrome et ChromeDriver (seulement avec --force)"""
     cache_dirs = [
         os.path.expanduser('~/.local/share/undetected_chromedriver'),
         os.path.expanduser('~/.cache/selenium'),
@@ -69,89 +82,109 @@ def clear_all_chrome_caches():
             logging.info(f"Nettoyage du cache: {cache_dir}")
             shutil.rmtree(cache_dir)
 
-def sync_chromedriver_with_force():
-    """Synchronise ChromeDriver en forçant l'utilisation du bon Chrome"""
+def get_cached_driver_path(full_version):
+    """Chemin du ChromeDriver en cache pour une version exacte de Chrome"""
+    return os.path.join(DRIVER_CACHE_DIR, full_version, DRIVER_BINARY)
+
+def driver_version(driver_path):
+    """Retourne la version rapportée par `chromedriver --version` (poignée de main légère)"""
+    try:
+        result = subprocess.run([driver_path, '--version'], 
+                              capture_output=True, text=True, check=True, timeout=15)
+        version_match = re.search(r'(\d+\.\d+\.\d+\.\d+)', result.stdout)
+        return version_match.group(1) if version_match else None
+    except Exception as e:
+        logging.warning(f"Vérification de {driver_path} impossible: {e}")
+        return None
+
+def find_download_url(full_version):
+    """URL du ChromeDriver correspondant à Chrome (version exacte, sinon dernier patch du même build)"""
+    exact_url = f"{CFT_DOWNLOAD_URL}/{full_version}/{CFT_PLATFORM}/chromedriver-{CFT_PLATFORM}.zip"
+    response = requests.head(exact_url, timeout=30)
+    if response.status_code == 200:
+        return exact_url
+    
+    build = full_version.rsplit('.', 1)[0]
+    logging.info(f"Pas de ChromeDriver pour {full_version}, recherche du dernier patch du build {build}")
+    versions = requests.get(CFT_BUILDS_URL, timeout=30).json()
+    downloads = versions['builds'][build]['downloads']['chromedriver']
+    return next(d['url'] for d in downloads if d['platform'] == CFT_PLATFORM)
+
+def download_chromedriver(full_version):
+    """Télécharge le ChromeDriver dans le cache versionné et retourne son chemin"""
+    url = find_download_url(full_version)
+    logging.info(f"Téléchargement ChromeDriver: {url}")
+    response = requests.get(url, timeout=120)
+    response.raise_for_status()
+    
+    target_dir = os.path.join(DRIVER_CACHE_DIR, full_version)
+    os.makedirs(target_dir, exist_ok=True)
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        member = next(name for name in archive.namelist() if name.endswith('/' + DRIVER_BINARY))
+        tmp_path = os.path.join(target_dir, DRIVER_BINARY + '.tmp')
+        with archive.open(member) as src, open(tmp_path, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+    os.chmod(tmp_path, 0o755)
+    driver_path = get_cached_driver_path(full_version)
+    os.replace(tmp_path, driver_path)
+    return driver_path
+
+def prune_driver_cache(keep_version):
+    """Supprime les ChromeDriver en cache des autres versions"""
+    if not os.path.isdir(DRIVER_CACHE_DIR):
+        return
+    for entry in os.listdir(DRIVER_CACHE_DIR):
+        if entry != keep_version:
+            logging.info(f"Suppression du ChromeDriver en cache: {entry}")
+            shutil.rmtree(os.path.join(DRIVER_CACHE_DIR, entry), ignore_errors=True)
+
+def provision_chromedriver(force=False):
+    """Réutilise le ChromeDriver en cache si sa version correspond à Chrome, sinon le télécharge"""
     try:
-        import undetected_chromedriver as uc
-        
-        # Détecter la version de Chrome
         major_version, full_version = get_chrome_version()
         
-        # Trouver le bon binaire Chrome
-        chrome_binary = force_chrome_binary_path()
-        if not chrome_binary:
+        if not force_chrome_binary_path():
             raise Exception("Aucun binaire Chrome valide trouvé")
         
-        # Nettoyer tous les caches
-        clear_all_chrome_caches()
-        
-        # Options Chrome
-        chrome_options = uc.ChromeOptions()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--disable-extensions")
-        chrome_options.add_argument("--disable-plugins")
-        
-        # FORCER l'utilisation du bon binaire Chrome
-        chrome_options.binary_location = chrome_binary
+        if force:
+            clear_all_chrome_caches()
+            shutil.rmtree(DRIVER_CACHE_DIR, ignore_errors=True)
         
-        logging.info(f"Forçage Chrome binaire: {chrome_binary}")
-        logging.info(f"Téléchargement ChromeDriver pour version {major_version}...")
+        driver_path = get_cached_driver_path(full_version)
+        cached_version = driver_version(driver_path) if os.path.exists(driver_path) else None
         
-        # Créer le driver avec le binaire forcé
-        driver = uc.Chrome(
-            options=chrome_options,
-            version_main=major_version,
-            driver_executable_path=None
-        )
-        
-        # Test rapide
-        logging.info("Test du ChromeDriver...")
-        driver.get("about:blank")
-        logging.info("✅ ChromeDriver synchronisé avec succès")
+        if cached_version and cached_version.split('.')[0] == str(major_version):
+            logging.info(f"✅ ChromeDriver {cached_version} en cache réutilisé: {driver_path}")
+        else:
+            driver_path = download_chromedriver(full_version)
+            cached_version = driver_version(driver_path)
+            if not cached_version or cached_version.split('.')[0] != str(major_version):
+                raise Exception(f"ChromeDriver {cached_version} incompatible avec Chrome {full_version}")
+            logging.info(f"✅ ChromeDriver {cached_version} téléchargé: {driver_path}")
         
-        driver.quit()
-        return True
+        prune_driver_cache(full_version)
+        export_driver_path(driver_path)
+        return driver_path
         
     except Exception as e:
         logging.error(f"Erreur lors de la synchronisation: {e}")
-        return False
+        return None
 
-def test_final():
-    """Test final avec configuration identique"""
-    try:
-        import undetected_chromedriver as uc
-        
-        chrome_binary = force_chrome_binary_path()
-        
-        chrome_options = uc.ChromeOptions()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.binary_location = chrome_binary
-        
-        driver = uc.Chrome(options=chrome_options, version_main=None)
-        driver.get("about:blank")
-        logging.info("✅ Test final réussi")
-        driver.quit()
-        return True
-        
-    except Exception as e:
-        logging.error(f"Échec du test final: {e}")
-        return False
+def export_driver_path(driver_path):
+    """Expose le chemin du ChromeDriver aux étapes suivantes du workflow (CHROMEDRIVER_PATH)"""
+    github_env = os.getenv('GITHUB_ENV')
+    if github_env:
+        with open(github_env, 'a', encoding='utf-8') as f:
+            f.write(f"CHROMEDRIVER_PATH={driver_path}\n")
+    logging.info(f"CHROMEDRIVER_PATH={driver_path}")
 
 if __name__ == "__main__":
-    logging.info("=== Synchronisation ChromeDriver FORCÉE ===")
+    force = '--force' in sys.argv
+    logging.info(f"=== Synchronisation ChromeDriver{' FORCÉE' if force else ''} ===")
     
-    if sync_chromedriver_with_force():
-        if test_final():
-            logging.info("🎉 Synchronisation forcée réussie")
-            sys.exit(0)
-        else:
-            logging.error("❌ Échec du test final")
-            sys.exit(1)
+    if provision_chromedriver(force=force):
+        logging.info("🎉 Synchronisation réussie")
+        sys.exit(0)
     else:
-        logging.error("❌ Échec de la synchronisation forcée")
+        logging.error("❌ Échec de la synchronisation")
         sys.exit(1)
@@ -0,0 +1,75 @@
+"""
+Extraction Chrome rejouée (pages synthétiques) : une page lente est un échec, jamais une journée sans match
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+os.environ.setdefault('SPORDLE_PASS', 'test')
+
+from benchmark_extraction import ReplayDriver, Scenario, SYNTHETIC_START, _extractor, synthetic_pages
+from models import Match
+from schedule_cache import ScheduleCache
+from spordle_facebook import reconcile_with_cache
+
+LOADING_PAGE = "<html><body><div>Loading...</div></body></html>"
+
+def _at(day) -> datetime:
+    return datetime.combine(day, datetime.min.time())
+
+class SlowPageTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.folder.name)  # fichier de debug (temp/) écrit hors du dépôt
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.folder.cleanup()
+
+    def _get_matches(self, pages, day, per_page=100):
+        scenario = Scenario("test", pages, day, per_page=per_page)
+        return _extractor(scenario, ReplayDriver(pages)).get_matches(_at(day))
+
+    def test_unrendered_page_is_a_failure(self):
+        self.assertIsNone(self._get_matches([LOADING_PAGE], SYNTHETIC_START))
+
+    def test_day_split_by_unrendered_page_is_a_failure(self):
+        # 10 matchs par jour, 15 par page : le 2e jour continue sur la page 2, restée "Loading..."
+        pages = synthetic_pages(20, 10, 15)
+        pages[1] = LOADING_PAGE
+        self.assertEqual(len(self._get_matches(pages, SYNTHETIC_START, per_page=15)), 10)
+        self.assertIsNone(self._get_matches(pages, SYNTHETIC_START + timedelta(days=1), per_page=15))
+
+    def test_day_without_games_in_loaded_schedule(self):
+        # Liste complète (une seule page) qui s'arrête avant la date : aucun match ce jour-là
+        pages = synthetic_pages(6, 2, 100)
+        self.assertEqual(self._get_matches(pages, SYNTHETIC_START + timedelta(days=5)), [])
+
+    def test_slow_page_publishes_from_cache(self):
+        config = mock.Mock(schedule_cache_file=str(Path(self.folder.name) / 'schedule.sqlite3'))
+        cached = [Match(SYNTHETIC_START.strftime("%A, %B %d, %Y"), "10:00", "TITANS 11UA", "ROYAUX 11UA", "Parc Ferland", "")]
+        cache = ScheduleCache(config.schedule_cache_file)
+        cache.update_day(SYNTHETIC_START, cached)
+        cache.close()
+
+        matches = self._get_matches([LOADING_PAGE], SYNTHETIC_START)
+        self.assertEqual(reconcile_with_cache(config, _at(SYNTHETIC_START), matches), cached)
+
+    def test_empty_day_is_cached(self):
+        config = mock.Mock(schedule_cache_file=str(Path(self.folder.name) / 'schedule.sqlite3'))
+        day = SYNTHETIC_START + timedelta(days=5)
+        self.assertEqual(reconcile_with_cache(config, _at(day), []), [])
+        cache = ScheduleCache(config.schedule_cache_file)
+        try:
+            self.assertEqual(cache.get_matches(day), [])
+        finally:
+            cache.close()
+
+if __name__ == "__main__":
+    unittest.main()